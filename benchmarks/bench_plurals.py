@@ -0,0 +1,63 @@
+"""Benchmark for __n (i18nTranslatePlural)
+
+Selects plural categories for counts 0..10^6 in a dozen locales, once through
+CLDR plural rules and once through the interval syntax. Run from the
+repository root:
+
+    python benchmarks/bench_plurals.py
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from simple_i18n import I18n
+
+
+LOCALES = ["en", "de", "fr", "es", "pt", "ru", "pl", "cs", "ar", "he", "ja", "lt"]
+
+STEP = 101
+
+COUNTS = range(0, 10**6 + 1, STEP)
+
+CATEGORIES = {
+    category: f"{category} %s"
+    for category in ["zero", "one", "two", "few", "many", "other"]
+}
+
+INTERVALS = "[0]none|[1]one %s|[2,5)few %s|[5,]many %s"
+
+
+def measure(function, locale):
+    phrase = {"singular": "%s item", "plural": "%s items", "locale": locale}
+    start = time.perf_counter()
+    for count in COUNTS:
+        function(phrase, count)
+    return (time.perf_counter() - start) / len(COUNTS) * 1e9
+
+
+def main():
+    catalog = {
+        locale: {"%s item": dict(CATEGORIES), "intervals": INTERVALS}
+        for locale in LOCALES
+    }
+    i18n = I18n({"staticCatalog": catalog, "defaultLocale": "en"})
+
+    print(f"{len(COUNTS)} counts in 0..10^6 (step {STEP}) per locale")
+    print(f"{'locale':<8}{'cldr (ns)':>12}{'interval (ns)':>16}")
+    for locale in LOCALES:
+        cldr = measure(i18n.__n, locale)
+        interval = measure(
+            lambda phrase, count: i18n.__n(
+                {"singular": "intervals", "plural": "intervals", "locale": locale},
+                count,
+            ),
+            locale,
+        )
+        print(f"{locale:<8}{cldr:>12.0f}{interval:>16.0f}")
+
+
+if __name__ == "__main__":
+    main()
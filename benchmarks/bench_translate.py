@@ -0,0 +1,64 @@
+"""Micro-benchmark for __ (i18nTranslate)
+
+Compares the reflective entry point that is active before configure() with the
+specialized one configure() installs. Run from the repository root:
+
+    python benchmarks/bench_translate.py
+"""
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from simple_i18n import I18n
+
+
+NUMBER = 200000
+
+CATALOG = {
+    "en": {
+        "Hello": "Hello",
+        "Hello %s": "Hello %s",
+        "Hello {{name}}": "Hello {{name}}",
+    },
+    "de": {
+        "Hello": "Hallo",
+        "Hello %s": "Hallo %s",
+        "Hello {{name}}": "Hallo {{name}}",
+    },
+}
+
+CASES = [
+    ("plain", ("Hello",)),
+    ("printf", ("Hello %s", "Marcus")),
+    ("mustache", ("Hello {{name}}", {"name": "Marcus"})),
+    ("locale object", ({"phrase": "Hello", "locale": "de"},)),
+]
+
+
+def measure(function, arguments):
+    seconds = min(
+        timeit.repeat(lambda: function(*arguments), number=NUMBER, repeat=3)
+    )
+    return seconds / NUMBER * 1e9
+
+
+def main():
+    i18n = I18n()
+    before = i18n.__
+    i18n.configure({"staticCatalog": CATALOG, "defaultLocale": "en"})
+    i18n.setLocale("de")
+    after = i18n.__
+
+    print(f"{'case':<16}{'before (ns)':>14}{'after (ns)':>14}{'speedup':>10}")
+    for name, arguments in CASES:
+        assert before(*arguments) == after(*arguments), name
+        slow = measure(before, arguments)
+        fast = measure(after, arguments)
+        print(f"{name:<16}{slow:>14.0f}{fast:>14.0f}{slow / fast:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -12,16 +12,41 @@ i18n = I18n({
     'directory': 'custom/path/to/locales/', # where to store json files - defaults to './locales' relative to modules directory
     'directoryPermissions': '755', # control mode on directory creation - defaults to NULL which defaults to umask of process user. Setting has no effect on win.
     'autoReload': True, # watch for changes in JSON files to reload locale on updates - defaults to false
+    'reloadDelay': 0.1, # wait this many seconds for a changed file to settle before reloading it, unchanged files are skipped - defaults to 0.1
+    'pollInterval': None, # check size and mtime of the files every this many seconds instead of relying on file system events,
+                          # for network and overlay volumes - defaults to None (events)
+    'lazyLoading': False, # read each locale file on first access instead of all of them up front - defaults to false
+    'preload': ['en'], # locales still read up front with lazyLoading - defaults to []
+    'loadWorkers': 8, # read up to this many locale files concurrently, i18n.getLoadTimings() reports the seconds per locale - defaults to None (one after another)
+    'loadExecutor': 'thread', # 'thread' or 'process' - parse in worker processes when files are large, needs a parser module - defaults to 'thread'
+    'namespaces': ['checkout', 'admin'], # shards in '<directory>/<locale>/<namespace>.json', read on first use of 'namespace:key' - defaults to []
+    'namespaceSeparator': ':', # separates the namespace from the key - defaults to ':'
+    'namespaceBudget': 1048576, # bytes of shard files kept in memory, the least recently used shards are dropped first - defaults to None (no limit)
     'updateFiles': False, # whether to write new locale information to disk - defaults to true
     'syncFiles': False, # sync locale information across all files - defaults to false
+    'flushInterval': 2, # write new locale information from a background thread at most once per interval in seconds,
+                        # call i18n.flush() to write pending changes right away - defaults to None (write immediately)
+    'journal': False, # append new keys as JSON lines to a '<file>.journal' next to each file instead of rewriting it - defaults to false
+    'journalMaxSize': 1048576, # fold the journal back into its file once it grows beyond this many bytes - defaults to 1 MiB
     'indent': '\t', # what to use as the indentation unit - defaults to '\t'
     'extension': '.json', # setting extension of json files - defaults to '.json' (you might want to set this to '.js' according to webtranslateit)
     'prefix': '', # setting prefix of json files name - default to none '' (in case you use different locale files naming scheme (webapp-en.json), rather then just en.json)
     'objectNotation': False, # enable object notation
+    'binaryCatalog': False, # compile each file to '<file>.bin' and map it into memory on the next start instead of parsing it,
+                            # shared by all processes - defaults to false, ignored with objectNotation
+    'sharedCatalog': False, # parse each file once per host into shared memory (True or a name shared by the processes),
+                            # the other processes attach and switch to each newly parsed generation - defaults to false, POSIX only
+                            # the last process to exit or call i18n.releaseSharedCatalogs() unlinks it
+    'dedupeCatalogs': False, # share parsed catalogs with every other instance of the process reading identical files,
+                             # each instance only keeps the keys it adds itself - defaults to false, ignored with objectNotation
+    'snapshotCache': False, # keep parsed catalogs as marshal snapshots next to each file (True) or in the given directory,
+                            # used while the file's size, mtime and content still match - defaults to false
     'logDebugFn': lambda msg: print(msg), # setting of log level DEBUG - default to logging.getLogger(__name__).debug
     'logWarnFn': lambda msg: print(msg), # setting of log level WARN - default to logging.getLogger(__name__).warning
     'logErrorFn': lambda msg: print(msg), # setting of log level ERROR - default to logging.getLogger(__name__).error
     'missingKeyFn': lambda locale, value: value, # used to alter the behaviour of missing keys
+    'contextLocale': False, # keep the locale set by i18n.setLocale() per thread or asyncio task (contextvars),
+                            # so one instance can serve concurrent requests - defaults to false
     'register': globals(), # object or [obj1, obj2] to bind the i18n api and current locale to - defaults to None
     'api': {}, # hash to specify different aliases for i18n's internal methods to apply on the request/response objects (method -> alias).
                # note that this will *not* overwrite existing properties with the same name
@@ -35,7 +60,8 @@ i18n = I18n({
         'tags': ['{{', '}}'],
         'disable': False
     },
-    'parser': json # Parser can be any object that responds to .loads & .dumps
+    'parser': json, # Parser can be any object that responds to .loads & .dumps
+    'messageCacheSize': 1000, # number of compiled messages cached per locale - defaults to 1000
 })
 
 # try using locale 'sk', however this locale is unavailable and will fallback to 'de'
@@ -56,3 +82,12 @@ i18n.__({ 'phrase': 'Hello', 'locale': 'fr' }) # -> Salut
 i18n.__({ 'phrase': 'Hello %s', 'locale': 'fr' }, 'Marcus') # -> Salut Marcus
 i18n.__({ 'phrase': 'Hello {{name}}', 'locale': 'fr' }, { 'name': 'Marcus' }) # -> Salut Marcus
 
+# reading keys of a namespace shard (locales/fr/checkout.json)
+i18n.__('checkout:Pay now') # -> Payer maintenant
+i18n.getNamespace('checkout').__('Pay now') # -> Payer maintenant
+
+# sharing one copy of the catalogs between forked workers (ie. gunicorn --preload)
+# def pre_fork(server, worker):
+#     i18n.beforeFork() # flush pending writes, stop watching files and freeze the catalogs
+# def post_fork(server, worker):
+#     i18n.afterFork() # start watching files again in the worker
@@ -11,22 +11,46 @@ __license__ = "MIT"
 
 
 # dependencies
-import functools
+import atexit
+import contextvars
+import gc
+import hashlib
+import html
+import http.cookies
+import importlib
 import inspect
 import json
 import logging
+import marshal
 import math
+import mmap
 import os
 import pystache
 import re
 import shutil
 import stat
-from threading import Lock
+import struct
+import sys
+import tempfile
+import time
+import urllib.parse
+import weakref
+import zlib
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import resource_tracker, shared_memory
+from threading import Condition, Lock, RLock, Thread, Timer, current_thread
 from typing import Any, Callable, overload, Optional, TypedDict
-from types import FunctionType, ModuleType
+from types import FunctionType, ModuleType, SimpleNamespace
 from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler
 
+try:
+    import fcntl
+except ImportError:
+    # no way to elect a single writer, catalogs are not shared
+    fcntl = None
+
 
 # type hinting
 class _MustacheConfigT(TypedDict):
@@ -61,6 +85,371 @@ class _OptionType(TypedDict):
     staticCatalog: Optional[dict[str, dict[str, dict[str, str]]]]
     mustacheConfig: Optional[_MustacheConfigT]
     parser: Optional[ModuleType | Any]
+    messageCacheSize: Optional[int]
+    flushInterval: Optional[float]
+    journal: Optional[bool]
+    journalMaxSize: Optional[int]
+    contextLocale: Optional[bool]
+    reloadDelay: Optional[float]
+    pollInterval: Optional[float]
+    binaryCatalog: Optional[bool]
+    sharedCatalog: Optional[bool | str]
+    dedupeCatalogs: Optional[bool]
+    snapshotCache: Optional[bool | str]
+    lazyLoading: Optional[bool]
+    preload: Optional[list[str]]
+    loadWorkers: Optional[int]
+    loadExecutor: Optional[str]
+    namespaces: Optional[list[str]]
+    namespaceSeparator: Optional[str]
+    namespaceBudget: Optional[int]
+
+
+# locale of the current thread or asyncio task for each contextLocale instance,
+# a single variable for the process since context variables are never freed
+_currentLocales = contextvars.ContextVar("i18n.locales", default=None)
+
+
+# parse in worker processes, which need a function they can import
+def _parseCatalog(parserName, content):
+    return importlib.import_module(parserName).loads(content)
+
+
+# parsed catalogs shared by every instance of the process, keyed by
+# resolved path, parser and content hash, and dropped with their last holder
+class _CatalogRegistry(object):
+    __catalogs = {}
+    __lock = Lock()
+
+    @staticmethod
+    def acquire(key, build):
+        with _CatalogRegistry.__lock:
+            entry = _CatalogRegistry.__catalogs.get(key)
+            if entry is not None:
+                entry["refs"] += 1
+                return entry["catalog"]
+        # parse outside the lock, the first one registered wins a race
+        catalog = build()
+        with _CatalogRegistry.__lock:
+            entry = _CatalogRegistry.__catalogs.setdefault(
+                key, {"catalog": catalog, "refs": 0}
+            )
+            entry["refs"] += 1
+            return entry["catalog"]
+
+    @staticmethod
+    def release(key):
+        with _CatalogRegistry.__lock:
+            entry = _CatalogRegistry.__catalogs.get(key)
+            if entry is None:
+                return
+            entry["refs"] -= 1
+            if entry["refs"] <= 0:
+                del _CatalogRegistry.__catalogs[key]
+
+
+# dispatches the events of the shared observer to the watchers of each directory
+class _WatchDispatcher(FileSystemEventHandler):
+    def on_any_event(self, event):
+        _FileWatcher.dispatch(event)
+        return super().on_any_event(event)
+
+
+# one observer thread per process, multiplexing every watched directory, each
+# subscriber only hears about files matching its prefix and suffixes, handlers
+# are held weakly so a watched instance can still be collected
+class _FileWatcher(object):
+    __observer = None
+    __watches = {}
+    __subscribers = {}
+    __lock = RLock()
+
+    @staticmethod
+    def subscribe(path, handler, prefix="", suffixes=("",)):
+        name = os.path.abspath(path)
+        subscription = {
+            "path": name,
+            "prefix": prefix or "",
+            "suffixes": tuple(suffixes),
+            "handler": weakref.ref(handler),
+        }
+        with _FileWatcher.__lock:
+            if _FileWatcher.__observer is None:
+                _FileWatcher.__observer = Observer()
+                _FileWatcher.__observer.start()
+            if name not in _FileWatcher.__watches:
+                _FileWatcher.__watches[name] = _FileWatcher.__observer.schedule(
+                    _WatchDispatcher(), name
+                )
+            # replaced rather than changed, dispatch reads them without the lock
+            _FileWatcher.__subscribers = {
+                **_FileWatcher.__subscribers,
+                name: [*_FileWatcher.__subscribers.get(name, []), subscription],
+            }
+        return subscription
+
+    @staticmethod
+    def unsubscribe(subscription):
+        name = subscription["path"]
+        with _FileWatcher.__lock:
+            subscribers = {**_FileWatcher.__subscribers}
+            remaining = [
+                other
+                for other in subscribers.get(name, [])
+                if other is not subscription
+            ]
+            if remaining:
+                subscribers[name] = remaining
+            else:
+                subscribers.pop(name, None)
+            _FileWatcher.__subscribers = subscribers
+            observer = _FileWatcher.__observer
+            if observer is None:
+                return
+            if not remaining and name in _FileWatcher.__watches:
+                observer.unschedule(_FileWatcher.__watches.pop(name))
+            # the last one leaving stops the thread, it ends on its own shortly
+            if not subscribers:
+                _FileWatcher.__observer = None
+                _FileWatcher.__watches = {}
+                observer.stop()
+
+    @staticmethod
+    def dispatch(event):
+        # files are replaced by moving them into place
+        if event.is_directory or event.event_type not in (
+            "created",
+            "modified",
+            "moved",
+            "deleted",
+        ):
+            return
+        paths = [event.src_path]
+        if event.event_type == "moved":
+            paths.append(event.dest_path)
+        subscribers = _FileWatcher.__subscribers
+        for path in dict.fromkeys(os.fsdecode(path) for path in paths):
+            directory, filename = os.path.split(path)
+            for subscription in subscribers.get(directory, []):
+                handler = subscription["handler"]()
+                if handler is None:
+                    continue
+                if filename.startswith(subscription["prefix"]) and filename.endswith(
+                    subscription["suffixes"]
+                ):
+                    try:
+                        handler(path)
+                    except Exception as handlerError:
+                        logging.getLogger(__name__).error(
+                            f"unable to handle change of {path}: {handlerError}"
+                        )
+
+    @staticmethod
+    def stop():
+        # runs before interpreter shutdown, when stopping can no longer block
+        with _FileWatcher.__lock:
+            observer = _FileWatcher.__observer
+            _FileWatcher.__observer = None
+            _FileWatcher.__watches = {}
+            _FileWatcher.__subscribers = {}
+        if observer is not None:
+            observer.stop()
+            if observer is not current_thread():
+                observer.join(timeout=5)
+
+    @staticmethod
+    def reset():
+        # the observer thread doesn't survive fork(), nor may the lock be held
+        _FileWatcher.__lock = RLock()
+        _FileWatcher.__observer = None
+        _FileWatcher.__watches = {}
+        _FileWatcher.__subscribers = {}
+
+
+# one thread per process comparing size, mtime and inode of the files in each
+# polled directory, for filesystems that don't deliver events (nfs, overlays),
+# handlers are held weakly like those of _FileWatcher
+class _FilePoller(object):
+    __thread = None
+    __subscribers = []
+    __condition = Condition()
+
+    @staticmethod
+    def subscribe(path, handler, prefix="", suffixes=("",), interval=1.0):
+        name = os.path.abspath(path)
+        subscription = {
+            "path": name,
+            "prefix": prefix or "",
+            "suffixes": tuple(suffixes),
+            "handler": weakref.ref(handler),
+            "interval": interval,
+            "due": time.monotonic() + interval,
+        }
+        # changes are reported relative to the files as they are now
+        subscription["seen"] = _FilePoller.match(subscription, _FilePoller.scan(name))
+        with _FilePoller.__condition:
+            _FilePoller.__subscribers = [*_FilePoller.__subscribers, subscription]
+            if _FilePoller.__thread is None:
+                _FilePoller.__thread = Thread(target=_FilePoller.run, daemon=True)
+                _FilePoller.__thread.start()
+            _FilePoller.__condition.notify_all()
+        return subscription
+
+    @staticmethod
+    def unsubscribe(subscription):
+        with _FilePoller.__condition:
+            _FilePoller.__subscribers = [
+                other
+                for other in _FilePoller.__subscribers
+                if other is not subscription
+            ]
+            # the last one leaving ends the thread
+            if not _FilePoller.__subscribers:
+                _FilePoller.__thread = None
+            _FilePoller.__condition.notify_all()
+
+    @staticmethod
+    def scan(path):
+        # a single listing of the directory per tick, however many files it holds
+        entries = {}
+        try:
+            with os.scandir(path) as iterator:
+                for entry in iterator:
+                    try:
+                        if entry.is_file():
+                            stats = entry.stat()
+                            entries[entry.name] = (
+                                stats.st_size,
+                                stats.st_mtime_ns,
+                                stats.st_ino,
+                            )
+                    except OSError:
+                        continue
+        except OSError:
+            pass
+        return entries
+
+    @staticmethod
+    def match(subscription, entries):
+        return {
+            name: signature
+            for name, signature in entries.items()
+            if name.startswith(subscription["prefix"])
+            and name.endswith(subscription["suffixes"])
+        }
+
+    @staticmethod
+    def run():
+        while True:
+            with _FilePoller.__condition:
+                if _FilePoller.__thread is not current_thread():
+                    return
+                now = time.monotonic()
+                due = [
+                    subscription
+                    for subscription in _FilePoller.__subscribers
+                    if subscription["due"] <= now
+                ]
+                if not due:
+                    _FilePoller.__condition.wait(
+                        min(
+                            subscription["due"]
+                            for subscription in _FilePoller.__subscribers
+                        )
+                        - now
+                    )
+                    continue
+                for subscription in due:
+                    subscription["due"] = now + subscription["interval"]
+            scans = {}
+            for subscription in due:
+                path = subscription["path"]
+                if path not in scans:
+                    scans[path] = _FilePoller.scan(path)
+                previous = subscription["seen"]
+                current = _FilePoller.match(subscription, scans[path])
+                subscription["seen"] = current
+                for name in sorted(previous.keys() | current.keys()):
+                    if previous.get(name) == current.get(name):
+                        continue
+                    handler = subscription["handler"]()
+                    if handler is None:
+                        break
+                    try:
+                        handler(os.path.join(path, name))
+                    except Exception as handlerError:
+                        logging.getLogger(__name__).error(
+                            f"unable to handle change of {name}: {handlerError}"
+                        )
+
+    @staticmethod
+    def stop():
+        with _FilePoller.__condition:
+            thread = _FilePoller.__thread
+            _FilePoller.__thread = None
+            _FilePoller.__subscribers = []
+            _FilePoller.__condition.notify_all()
+        if thread is not None and thread is not current_thread():
+            thread.join(timeout=5)
+
+    @staticmethod
+    def reset():
+        # the polling thread doesn't survive fork(), nor may the lock be held
+        _FilePoller.__condition = Condition()
+        _FilePoller.__thread = None
+        _FilePoller.__subscribers = []
+
+
+# instances still alive at exit write what they have pending, one hook for all
+_instances = weakref.WeakSet()
+
+
+def _flushInstances():
+    for instance in list(_instances):
+        instance.flush()
+
+
+# shared memory outlives the process, the last user alive at exit unlinks it
+def _releaseInstances():
+    for instance in list(_instances):
+        instance.releaseSharedCatalogs()
+
+
+def _flushLoop(condition, interval, pending, flush):
+    # pending and flush are weak references, an idle flusher doesn't keep its instance alive
+    while True:
+        deadline = None
+        with condition:
+            while True:
+                check = pending()
+                state = check() if check is not None else None
+                check = None
+                if state is None:
+                    return
+                if not state:
+                    deadline = None
+                    condition.wait()
+                    continue
+                # let further mutations coalesce into the same write
+                deadline = deadline or time.monotonic() + interval
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                condition.wait(remaining)
+        write = flush()
+        if write is None:
+            return
+        write()
+        write = None
+
+
+atexit.register(_flushInstances)
+atexit.register(_releaseInstances)
+atexit.register(_FileWatcher.stop)
+atexit.register(_FilePoller.stop)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_FileWatcher.reset)
+    os.register_at_fork(after_in_child=_FilePoller.reset)
 
 
 # create constructor function
@@ -83,6 +472,24 @@ def I18n(_OPTS: _OptionType = False):
     MessageformatInstanceForLocale = {}
     PluralsForLocale = {}
     locales = {}
+    pendingLocales = set()
+    loadTimings = {}
+    loadWorkers = None
+    loadExecutor = "thread"
+    loadLocks = {}
+    loadLock = Lock()
+    translationIndex = {}
+    translationLists = {}
+    dottedIndex = {}
+    indexedLocales = ()
+    syncedKeys = set()
+    subscribers = []
+    acceptedLanguagesCache = OrderedDict()
+    acceptedLanguagesCacheSize = 512
+    fallbackTable = None
+    resolvedLocales = OrderedDict()
+    resolvedLocalesSize = 1024
+    lookupTranslation = None
     api = {
         "__": "__",
         "__n": "__n",
@@ -98,8 +505,19 @@ def I18n(_OPTS: _OptionType = False):
     }
     mustacheConfig = {"tags": ["{{", "}}"], "disable": False}
     mustacheRegex = None
+    mustacheRenderer = None
+    compiledMessages = {}
+    messageCacheSize = 1000
     pathsep = os.path.sep
     autoReload = False
+    reloadHandler = None
+    watchSubscription = None
+    frozen = False
+    reloadDelay = 0.1
+    pollInterval = None
+    reloadTimers = {}
+    reloadLock = Lock()
+    catalogDigests = {}
     cookiename = None
     languageHeaderName = None
     defaultLocale = None
@@ -114,25 +532,77 @@ def I18n(_OPTS: _OptionType = False):
     logWarnFn = None
     preserveLegacyCase = True
     objectNotation = False
+    binaryCatalog = False
+    sharedCatalog = False
+    sharedRefs = {}
+    dedupeCatalogs = False
+    snapshotCache = False
     prefix = None
     queryParameter = None
     register = None
+    contextLocale = False
+    contextKey = object()
+    requestLocales = False
     updateFiles = True
     syncFiles = False
+    flushInterval = None
+    flusher = None
+    flushCondition = Condition()
+    dirtyLocales = set()
+    journal = False
+    journalMaxSize = 1048576
+    journalEntries = {}
+    catalogLock = RLock()
+    writeLock = Lock()
     missingKeyFn = None
     parser = None
+    namespaces = []
+    namespaceSeparator = ":"
+    namespaceBudget = None
+    shards = OrderedDict()
+    shardSizes = {}
+    shardStats = {}
+    pendingShards = {}
+    shardJournal = {}
+    shardLock = Lock()
 
     # public exports
     i18n = {}
+    owner = None
 
     i18n["version"] = "0.1.1"
 
     def i18nConfigure(opt=_OPTS, *args, **kwargs):
         # access variables from upper function
-        nonlocal locales, api, mustacheConfig, mustacheRegex, autoReload, cookiename, languageHeaderName, defaultLocale, retryInDefaultLocale, directory, directoryPermissions, extension, fallbacks, indent, logDebugFn, logErrorFn, logWarnFn, preserveLegacyCase, objectNotation, prefix, queryParameter, register, updateFiles, syncFiles, missingKeyFn, parser
+        nonlocal locales, pendingLocales, loadTimings, loadWorkers, loadExecutor, translationIndex, translationLists, dottedIndex, indexedLocales, syncedKeys, lookupTranslation, fallbackTable, api, mustacheConfig, mustacheRegex, mustacheRenderer, compiledMessages, messageCacheSize, autoReload, reloadHandler, frozen, reloadDelay, pollInterval, catalogDigests, cookiename, languageHeaderName, defaultLocale, retryInDefaultLocale, directory, directoryPermissions, extension, fallbacks, indent, logDebugFn, logErrorFn, logWarnFn, preserveLegacyCase, objectNotation, binaryCatalog, sharedCatalog, dedupeCatalogs, snapshotCache, prefix, queryParameter, register, contextLocale, updateFiles, syncFiles, flushInterval, journal, journalMaxSize, journalEntries, missingKeyFn, parser, namespaces, namespaceSeparator, namespaceBudget, shards, shardSizes, shardStats, pendingShards, shardJournal
+
+        # pending writes and watched files belong to the previous configuration
+        stopFlusher()
+        releaseCatalogs()
+        unwatchFiles()
 
         # reset locales
         locales = {}
+        pendingLocales = set()
+        reloadHandler = None
+        frozen = False
+        loadTimings = {}
+        catalogDigests = {}
+        translationIndex = {}
+        translationLists = {}
+        dottedIndex = {}
+        indexedLocales = ()
+        syncedKeys = set()
+        shards = OrderedDict()
+        shardSizes = {}
+        shardStats = {}
+        pendingShards = {}
+        shardJournal = {}
+        acceptedLanguagesCache.clear()
+        resolvedLocales.clear()
+
+        # remember the entry point registered objects may still be bound to
+        previousTranslate = i18n["__"]
 
         # Provide custom API method aliases if desired
         # This needs to be processed before the first call to applyAPItoObject()
@@ -153,6 +623,11 @@ def I18n(_OPTS: _OptionType = False):
             else:
                 applyAPItoObject(opt["register"])
 
+        # keep the current locale per thread or asyncio task instead of on the shared instance
+        contextLocale = (
+            opt["contextLocale"] if checkValues(opt, ["contextLocale", bool]) else False
+        )
+
         # sets a custom cookie name to parse locale settings from
         cookiename = opt["cookie"] if checkValues(opt, ["cookie", str]) else None
 
@@ -188,6 +663,26 @@ def I18n(_OPTS: _OptionType = False):
         # sync locale information accros all files
         syncFiles = opt["syncFiles"] if checkValues(opt, ["syncFiles", bool]) else False
 
+        # write new locale information from a background thread, at most once per interval (seconds)
+        flushInterval = (
+            opt["flushInterval"]
+            if checkValues(opt, ["flushInterval", int, float])
+            and opt["flushInterval"] > 0
+            else None
+        )
+
+        # append new keys to a journal next to each file instead of rewriting it
+        journal = opt["journal"] if checkValues(opt, ["journal", bool]) else False
+        journalEntries = {}
+
+        # fold the journal back into its file when it grows beyond this many bytes
+        journalMaxSize = (
+            opt["journalMaxSize"]
+            if checkValues(opt, ["journalMaxSize", int])
+            and opt["journalMaxSize"] > 0
+            else 1048576
+        )
+
         # what to use as the indentation unit (ex: '\t', '  ')
         indent = opt["indent"] if checkValues(opt, ["indent", str]) else "\t"
 
@@ -216,6 +711,22 @@ def I18n(_OPTS: _OptionType = False):
             opt["autoReload"] if checkValues(opt, ["autoReload", bool]) else False
         )
 
+        # wait this long (seconds) for a file to settle before reloading it
+        reloadDelay = (
+            opt["reloadDelay"]
+            if checkValues(opt, ["reloadDelay", int, float])
+            and opt["reloadDelay"] >= 0
+            else 0.1
+        )
+
+        # poll the files for changes every this many seconds instead of waiting for events
+        pollInterval = (
+            opt["pollInterval"]
+            if checkValues(opt, ["pollInterval", int, float])
+            and opt["pollInterval"] > 0
+            else None
+        )
+
         # enable object notation?
         objectNotation = (
             opt["objectNotation"] if checkValues(opt, "objectNotation") else False
@@ -223,8 +734,71 @@ def I18n(_OPTS: _OptionType = False):
         if objectNotation == True:
             objectNotation = "."
 
+        # map compiled copies of the files into memory instead of parsing them (flat catalogs only)
+        binaryCatalog = (
+            opt["binaryCatalog"]
+            if checkValues(opt, ["binaryCatalog", bool]) and not objectNotation
+            else False
+        )
+
+        # parse once per host into shared memory, every process with the same name attaches
+        sharedCatalog = (
+            opt["sharedCatalog"]
+            if checkValues(opt, ["sharedCatalog", bool, str])
+            and not objectNotation
+            and fcntl is not None
+            else False
+        )
+
+        # share parsed catalogs with other instances reading the same files (flat catalogs only)
+        dedupeCatalogs = (
+            opt["dedupeCatalogs"]
+            if checkValues(opt, ["dedupeCatalogs", bool]) and not objectNotation
+            else False
+        )
+
+        # keep parsed catalogs as snapshots next to each file, or in the given directory
+        snapshotCache = (
+            opt["snapshotCache"]
+            if checkValues(opt, ["snapshotCache", bool, str])
+            else False
+        )
+
+        # read locale files concurrently, in threads or with parsing in processes
+        loadWorkers = (
+            opt["loadWorkers"]
+            if checkValues(opt, ["loadWorkers", int]) and opt["loadWorkers"] > 1
+            else None
+        )
+        loadExecutor = (
+            opt["loadExecutor"]
+            if checkValues(opt, ["loadExecutor", str])
+            and opt["loadExecutor"] in ["thread", "process"]
+            else "thread"
+        )
+
+        # split locales into namespace shards (<directory>/<locale>/<namespace>.json),
+        # each read on first use of 'namespace:key'
+        namespaces = (
+            opt["namespaces"] if checkValues(opt, ["namespaces", list]) else []
+        )
+        namespaceSeparator = (
+            opt["namespaceSeparator"]
+            if checkValues(opt, ["namespaceSeparator", str])
+            and opt["namespaceSeparator"]
+            else ":"
+        )
+
+        # size (bytes of their files) of the shards kept in memory, least recently used go first
+        namespaceBudget = (
+            opt["namespaceBudget"]
+            if checkValues(opt, ["namespaceBudget", int]) and opt["namespaceBudget"] > 0
+            else None
+        )
+
         # read language fallback map
         fallbacks = opt["fallbacks"] if checkValues(opt, ["fallbacks", dict]) else {}
+        fallbackTable = compileFallbacks(fallbacks)
 
         # setting custom logger functions
         logging.basicConfig(level=logging.CRITICAL)
@@ -278,6 +852,10 @@ def I18n(_OPTS: _OptionType = False):
             updateFiles = False
             autoReload = False
             syncFiles = False
+            binaryCatalog = False
+            sharedCatalog = False
+            dedupeCatalogs = False
+            snapshotCache = False
 
         # customize mustache parsing
         if checkValues(opt, "mustacheConfig"):
@@ -291,23 +869,46 @@ def I18n(_OPTS: _OptionType = False):
 
         [start, end] = mustacheConfig["tags"]
         mustacheRegex = re.compile(rf"{escapeRegExp(start)}.*{escapeRegExp(end)}")
+        mustacheRenderer = pystache.Renderer(partials={})
+
+        # compiled messages depend on the mustache settings above
+        compiledMessages = {}
+        MessageformatInstanceForLocale.clear()
+        messageCacheSize = (
+            opt["messageCacheSize"]
+            if checkValues(opt, ["messageCacheSize", int])
+            and opt["messageCacheSize"] > 0
+            else 1000
+        )
 
         # implicitly read all locales
         if checkValues(opt, ["locales", list]):
             if checkValues(opt, "staticCatalog"):
                 locales = opt["staticCatalog"]
+                for locale in locales:
+                    publishCatalog(locale, locales[locale])
+            elif checkValues(opt, ["lazyLoading", bool]) and opt["lazyLoading"]:
+                # only critical locales are read now, any other on first access
+                preload = opt["preload"] if checkValues(opt, ["preload", list]) else []
+                pendingLocales = set(opt["locales"])
+                for locale in preload:
+                    loadLocale(locale)
+            elif loadWorkers:
+                readAll(opt["locales"])
             else:
                 for locale in opt["locales"]:
                     read(locale)
 
             # auto reload locale files when changed
             if autoReload:
-                # watch changes of locale files (it's called twice because watchFiles is still unstable)
-                def handler(event):
+                # watch changes of locale files
+                def handler(path):
                     # access variables from upper function
                     nonlocal opt
 
-                    filename = os.path.basename(event.src_path)
+                    filename = os.path.basename(path)
+                    if filename.endswith(".journal"):
+                        filename = filename[: -len(".journal")]
                     localeFromFile = guessLocaleFromFile(filename)
 
                     if (
@@ -315,18 +916,123 @@ def I18n(_OPTS: _OptionType = False):
                         and checkValues(opt["locales"], localeFromFile)
                         and opt["locales"].index(localeFromFile) > -1
                     ):
-                        logDebug(f"Auto reloading locale file '{filename}'.")
-                        read(localeFromFile)
+                        scheduleReload(localeFromFile)
 
-                watchFiles(directory, handler)
+                # forked workers start watching again with the same handler
+                reloadHandler = handler
+                watchFiles(handler)
+
+        # pick the translate entry point matching the options above, once
+        lookupTranslation = compileLookup()
+        i18n["__"] = compileTranslate()
+        rebindTranslate(previousTranslate)
+        bindOwner()
 
     i18n["configure"] = i18nConfigure
 
-    def i18nInit(request, response, next, *args, **kwargs):
-        raise NotImplementedError
+    def i18nInit(request=None, response=None, next=None, *args, **kwargs):
+        # access variables from upper function
+        nonlocal i18n
+
+        if type(request) is dict:
+            # guess requested language/locale
+            guessLanguage(request)
+            # bind api to req
+            applyAPItoObject(request)
+            # looks double but will ensure schema on api refactor
+            i18n["setLocale"](request, request["locale"])
+        else:
+            return logError(
+                "i18n.init must be called with one parameter minimum, ie. i18n.init(req)"
+            )
+
+        if type(response) is dict:
+            applyAPItoObject(response)
+            # and set that locale to response too
+            i18n["setLocale"](response, request["locale"])
+
+        # head over to next callback when bound as middleware
+        if callable(next):
+            return next()
 
     i18n["init"] = i18nInit
 
+    def i18nWsgiMiddleware(application, *args, **kwargs):
+        # access variables from upper function
+        nonlocal contextLocale, cookiename, requestLocales
+
+        # translators bound to requests pass their locale through the context
+        requestLocales = True
+
+        def middleware(environ, start_response):
+            query = environ.get("QUERY_STRING")
+            request = {
+                "headers": {
+                    key[5:].lower().replace("_", "-"): value
+                    for key, value in environ.items()
+                    if key.startswith("HTTP_")
+                },
+                "url": environ.get("PATH_INFO", "") + (f"?{query}" if query else ""),
+                "cookies": parseCookies(environ.get("HTTP_COOKIE"))
+                if cookiename
+                else {},
+            }
+            bindRequestApi(request)
+            i18nInit(request)
+            environ["i18n"] = request
+
+            # the locale is reset once the server closes the response
+            if not contextLocale:
+                return application(environ, start_response)
+            token = setContextLocale(request["locale"])
+            try:
+                response = application(environ, start_response)
+            except BaseException:
+                resetContextLocale(token)
+                raise
+            return _ClosingResponse(response, lambda: resetContextLocale(token))
+
+        return middleware
+
+    i18n["wsgiMiddleware"] = i18nWsgiMiddleware
+
+    def i18nAsgiMiddleware(application, *args, **kwargs):
+        # access variables from upper function
+        nonlocal contextLocale, cookiename, requestLocales
+
+        # translators bound to requests pass their locale through the context
+        requestLocales = True
+
+        async def middleware(scope, receive, send):
+            if scope.get("type") not in ("http", "websocket"):
+                return await application(scope, receive, send)
+
+            headers = {
+                name.decode("latin-1").lower(): value.decode("latin-1")
+                for name, value in scope.get("headers") or []
+            }
+            query = (scope.get("query_string") or b"").decode("latin-1")
+            request = {
+                "headers": headers,
+                "url": scope.get("path", "") + (f"?{query}" if query else ""),
+                "cookies": parseCookies(headers.get("cookie")) if cookiename else {},
+            }
+            bindRequestApi(request)
+            i18nInit(request)
+            scope = {**scope, "i18n": request}
+
+            # the task running the application inherits the locale
+            token = setContextLocale(request["locale"]) if contextLocale else None
+            try:
+                return await application(scope, receive, send)
+            finally:
+                if token is not None:
+                    resetContextLocale(token)
+
+        return middleware
+
+    i18n["asgiMiddleware"] = i18nAsgiMiddleware
+
     def i18nTranslate(phrase=None, *args, **kwargs):
         # access variables from upper function
         nonlocal i18n
@@ -338,14 +1044,17 @@ def I18n(_OPTS: _OptionType = False):
 
         # called like __({phrase: 'Hello', locale: 'en'})
         if type(phrase) is dict:
+            locale = None
             if checkValues(phrase, ["locale", str]) and checkValues(
                 phrase, ["phrase", str]
             ):
-                msg = translate(phrase["locale"], phrase["phrase"])
+                locale = phrase["locale"]
+                msg = translate(locale, phrase["phrase"])
         # called like __('Hello')
         else:
             # get translated message with locale from scope (deprecated) or object
-            msg = translate(getLocaleFromObject(i18n), phrase)
+            locale = getLocaleFromObject(i18n)
+            msg = translate(locale, phrase)
 
         # postprocess to get compatible to plurals
         if (type(msg) is dict or type(msg) is list) and checkValues(msg, "one"):
@@ -356,27 +1065,124 @@ def I18n(_OPTS: _OptionType = False):
             msg = msg["other"]
 
         # head over to postProcessing
-        return postProcess(msg, namedValues, arguments)
+        return postProcess(msg, namedValues, arguments, None, locale)
 
     i18n["__"] = i18nTranslate
 
-    def i18nMessageformat(phrase, *args, **kwargs):
-        raise NotImplementedError
+    def i18nMessageformat(phrase=None, *args, **kwargs):
+        # access variables from upper function
+        nonlocal i18n, defaultLocale, lookupTranslation
+
+        msg = None
+        targetLocale = defaultLocale
+        [namedValues, arguments] = parseArgv([phrase, *args, *kwargs.values()])
+
+        # called like __mf({phrase: 'Hello', locale: 'en'})
+        if type(phrase) is dict:
+            if checkValues(phrase, ["locale", str]) and checkValues(
+                phrase, ["phrase", str]
+            ):
+                targetLocale = phrase["locale"]
+                msg = translate(phrase["locale"], phrase["phrase"])
+        # called like __mf('Hello')
+        else:
+            # get translated message with locale from scope (deprecated) or object
+            targetLocale = getLocaleFromObject(i18n) or defaultLocale
+            msg = (lookupTranslation or translate)(targetLocale, phrase)
+
+        # format with the cached MessageFormat function for this pattern, its output
+        # differs with the values, so caching it would only evict other messages
+        if type(msg) is str:
+            msg = getMessageformat(targetLocale, msg)(namedValues, None)
+            return postProcess(msg, namedValues, arguments, None, targetLocale, False)
+
+        # head over to postProcessing
+        return postProcess(msg, namedValues, arguments, None, targetLocale)
 
     i18n["__mf"] = i18nMessageformat
 
     def i18nTranslationList(phrase, *args, **kwargs):
-        raise NotImplementedError
+        return [translation for _, translation in getTranslations(phrase)]
 
     i18n["__l"] = i18nTranslationList
 
     def i18nTranslationHash(phrase, *args, **kwargs):
-        raise NotImplementedError
+        return [{locale: translation} for locale, translation in getTranslations(phrase)]
 
     i18n["__h"] = i18nTranslationHash
 
-    def i18nTranslatePlural(singular, plural, count, *args, **kwargs):
-        raise NotImplementedError
+    def i18nTranslatePlural(singular=None, plural=None, count=None, *args, **kwargs):
+        # access variables from upper function
+        nonlocal i18n, defaultLocale, lookupTranslation
+
+        msg = None
+        targetLocale = None
+        arguments = [singular, plural, count, *args, *kwargs.values()]
+        if not args and not kwargs:
+            while len(arguments) > 1 and arguments[-1] is None:
+                arguments.pop()
+
+        # Accept an object with named values as the last parameter
+        if argsEndWithNamedObject(arguments):
+            namedValues = arguments[-1]
+            argv = arguments[3:-1] if len(arguments) >= 5 else []
+        else:
+            namedValues = {}
+            argv = arguments[3:] if len(arguments) >= 4 else []
+
+        # called like __n({'singular': '%s cat', 'plural': '%s cats', 'locale': 'en'}, 3)
+        if type(singular) is dict:
+            if (
+                checkValues(singular, ["locale", str])
+                and checkValues(singular, ["singular", str])
+                and checkValues(singular, ["plural", str])
+            ):
+                targetLocale = singular["locale"]
+                msg = (lookupTranslation or translate)(
+                    singular["locale"], singular["singular"], singular["plural"]
+                )
+            argv.insert(0, count)
+
+            # some template engines pass all values as strings -> so we try to convert them to numbers
+            if isNumber(plural):
+                count = plural
+
+            # called like __n({'singular': '%s cat', 'plural': '%s cats', 'locale': 'en', 'count': 3})
+            if checkValues(singular, ["count", int, float, str]):
+                count = singular["count"]
+                argv.insert(0, plural)
+        else:
+            # called like __n('cat', 3)
+            if isNumber(plural):
+                count = plural
+
+                # we add same string as default
+                # which efectivly copies the key to the plural.value
+                # this is for initialization of new empty translations
+                plural = singular
+
+                argv.insert(0, count)
+                argv.insert(0, plural)
+
+            # called like __n('%s cat', '%s cats', 3)
+            # get translated message with locale from scope (deprecated) or object
+            targetLocale = getLocaleFromObject(i18n)
+            msg = (lookupTranslation or translate)(targetLocale, singular, plural)
+
+        if count is None and type(namedValues) is dict:
+            count = namedValues.get("count")
+
+        # enforce number
+        count = toNumber(count)
+
+        # find the correct plural rule for given locale
+        if type(msg) is dict:
+            msg = msg.get(getPlural(targetLocale or defaultLocale)(count)) or msg.get(
+                "other"
+            )
+
+        # head over to postProcessing
+        return postProcess(msg, namedValues, argv, count, targetLocale)
 
     i18n["__n"] = i18nTranslatePlural
 
@@ -384,7 +1190,7 @@ def I18n(_OPTS: _OptionType = False):
         obj=None, locale=None, skipImplicitObjects=False, *args, **kwargs
     ):
         # access variables from upper function
-        nonlocal i18n, locales, defaultLocale, fallbacks, register
+        nonlocal i18n, locales, defaultLocale, fallbacks, register, contextLocale
 
         # when given an array of objects => setLocale on each
         if type(obj) is list and type(locale) is str:
@@ -402,16 +1208,24 @@ def I18n(_OPTS: _OptionType = False):
             targetLocale = obj
 
         # consider a fallback
-        if checkValues(locales, targetLocale):
+        if not loadLocale(targetLocale):
             targetLocale = getFallback(targetLocale, fallbacks) or targetLocale
+            loadLocale(targetLocale)
+
+        # the instance itself is shared, so only the current context gets the locale
+        if contextLocale and targetObject is i18n:
+            setContextLocale(
+                targetLocale if checkValues(locales, targetLocale) else defaultLocale
+            )
+            return i18n["getLocale"]()
 
         # now set locale on object
         targetObject["locale"] = (
             targetLocale if checkValues(locales, targetLocale) else defaultLocale
         )
 
-        # consider any extra registered objects
-        if type(register) is dict or type(register) is list:
+        # consider any extra registered objects, shared by all contexts in contextLocale mode
+        if not contextLocale and (type(register) is dict or type(register) is list):
             if type(register) is list and not skipImplicitObjects:
                 for r in register:
                     r["locale"] = targetObject["locale"]
@@ -448,7 +1262,7 @@ def I18n(_OPTS: _OptionType = False):
 
     i18n["setLocale"] = i18nSetLocale
 
-    def i18nGetLocale(request, *args, **kwargs):
+    def i18nGetLocale(request=None, *args, **kwargs):
         # access variables from upper function
         nonlocal i18n, defaultLocale
 
@@ -457,7 +1271,7 @@ def I18n(_OPTS: _OptionType = False):
             return request["locale"]
 
         # called like req.getLocale()
-        return i18n["locale"] or defaultLocale
+        return getLocaleFromObject(i18n) or defaultLocale
 
     i18n["getLocale"] = i18nGetLocale
 
@@ -481,40 +1295,548 @@ def I18n(_OPTS: _OptionType = False):
 
     i18n["removeLocale"] = i18nRemoveLocale
 
+    def i18nFlush(*args, **kwargs):
+        # access variables from upper function
+        nonlocal dirtyLocales
+
+        # write every locale with pending changes right now
+        with flushCondition:
+            pending = dirtyLocales
+            dirtyLocales = set()
+        for locale in sorted(pending, key=str):
+            writeChanges(locale)
+
+    i18n["flush"] = i18nFlush
+
+    def i18nSubscribe(callback, *args, **kwargs):
+        # access variables from upper function
+        nonlocal subscribers
+
+        # called like callback('en', {'added': [...], 'changed': [...], 'removed': [...]})
+        # whenever a reload changed the catalog of a locale
+        subscribers = [*subscribers, callback]
+
+        def unsubscribe(*args, **kwargs):
+            # access variables from upper function
+            nonlocal subscribers
+
+            subscribers = [fn for fn in subscribers if fn is not callback]
+
+        return unsubscribe
+
+    i18n["subscribe"] = i18nSubscribe
+
+    def i18nGetNamespace(namespace, *args, **kwargs):
+        # access variables from upper function
+        nonlocal i18n, namespaceSeparator
+
+        # called like getNamespace('checkout').__('Pay now'), same as __('checkout:Pay now')
+        def qualify(phrase):
+            if type(phrase) is str:
+                return f"{namespace}{namespaceSeparator}{phrase}"
+            if type(phrase) is dict:
+                return {
+                    **phrase,
+                    **{
+                        key: qualify(phrase[key])
+                        for key in ["phrase", "singular"]
+                        if type(phrase.get(key)) is str
+                    },
+                }
+            return phrase
+
+        return SimpleNamespace(
+            **{
+                name: (
+                    lambda name: lambda phrase=None, *args, **kwargs: i18n[name](
+                        qualify(phrase), *args, **kwargs
+                    )
+                )(name)
+                for name in ["__", "__n", "__mf", "__l", "__h"]
+            }
+        )
+
+    i18n["getNamespace"] = i18nGetNamespace
+
+    def i18nGetLoadTimings(*args, **kwargs):
+        # access variables from upper function
+        nonlocal loadTimings
+
+        # seconds spent reading and parsing each locale file, by locale
+        return dict(loadTimings)
+
+    i18n["getLoadTimings"] = i18nGetLoadTimings
+
+    def i18nBeforeFork(*args, **kwargs):
+        # access variables from upper function
+        nonlocal frozen
+
+        # nothing pending may be lost, nor written by each worker
+        stopFlusher()
+
+        # threads don't survive fork(), the workers start their own
+        unwatchFiles()
+        with reloadLock:
+            for timer in reloadTimers.values():
+                timer.cancel()
+            reloadTimers.clear()
+
+        # catalogs aren't written to anymore and the collector leaves them alone,
+        # so their memory stays shared between the workers
+        frozen = True
+        gc.collect()
+        gc.freeze()
+
+    i18n["beforeFork"] = i18nBeforeFork
+
+    def i18nAfterFork(*args, **kwargs):
+        # access variables from upper function
+        nonlocal reloadHandler, flusher, flushCondition, catalogLock, writeLock, reloadLock, loadLock, loadLocks, shardLock, sharedRefs
+
+        # locks may have been held by threads of the parent process
+        flusher = None
+        flushCondition = Condition()
+        catalogLock = RLock()
+        writeLock = Lock()
+        reloadLock = Lock()
+        loadLock = Lock()
+        loadLocks = {}
+        shardLock = Lock()
+
+        # inherited descriptors share the locks of the parent, each worker is a
+        # user of the shared catalogs on its own
+        for locale, (name, users) in list(sharedRefs.items()):
+            sharedRefs[locale] = (name, openSharedUsers(name))
+            users.close()
+
+        # the observer of the parent process is gone
+        if reloadHandler is not None:
+            watchFiles(reloadHandler)
+
+    i18n["afterFork"] = i18nAfterFork
+
+    def i18nReleaseSharedCatalogs(*args, **kwargs):
+        # let go of the shared memory of all locales, the last user unlinks it,
+        # locales read again afterwards attach to it or publish it anew
+        releaseSharedCatalogs()
+
+    i18n["releaseSharedCatalogs"] = i18nReleaseSharedCatalogs
+
     # ===================
     # = private methods =
     # ===================
 
+    def compileLookup(*args, **kwargs):
+        # access variables from upper function
+        nonlocal locales, dottedIndex, syncedKeys, objectNotation, syncFiles, retryInDefaultLocale
+
+        # retryInDefaultLocale only matters on a miss, which always goes through translate()
+        # keys not yet synced to all files go through translate() once
+        sync = syncFiles
+
+        # nested keys resolve through the flattened index of each locale
+        catalogs = dottedIndex if objectNotation else locales
+
+        def lookup(locale, singular, plural=None):
+            if sync and singular not in syncedKeys:
+                return translate(locale, singular, plural)
+            catalog = catalogs.get(locale)
+            msg = catalog.get(singular) if catalog is not None else None
+            return translate(locale, singular, plural) if msg is None else msg
+
+        return lookup
+
+    def compileTranslate(*args, **kwargs):
+        # access variables from upper function
+        nonlocal i18n, mustacheConfig, lookupTranslation
+
+        lookup = lookupTranslation
+
+        # messages without these markers are returned as is, skipping postProcess
+        mustache = not mustacheConfig["disable"]
+        start = mustacheConfig["tags"][0]
+
+        def i18nTranslateFast(phrase=None, *args, **kwargs):
+            # same argument semantics as i18nTranslate, without reflection
+            if kwargs:
+                args += tuple(kwargs.values())
+            if args and args[-1] is not None and type(args[-1]) in (dict, list):
+                namedValues = args[-1]
+                arguments = args[:-1]
+            else:
+                namedValues = {}
+                arguments = args
+
+            # called like __({phrase: 'Hello', locale: 'en'})
+            if type(phrase) is dict:
+                locale = phrase.get("locale")
+                msg = (
+                    translate(locale, phrase["phrase"])
+                    if type(locale) is str and type(phrase.get("phrase")) is str
+                    else None
+                )
+            # called like __('Hello')
+            else:
+                locale = getLocaleFromObject(i18n)
+                msg = lookup(locale, phrase)
+
+            # postprocess to get compatible to plurals
+            if type(msg) is str:
+                if "|" not in msg and "%" not in msg and not (mustache and start in msg):
+                    return msg
+            elif type(msg) is dict or type(msg) is list:
+                if "one" in msg:
+                    msg = msg["one"]
+                if (type(msg) is dict or type(msg) is list) and "other" in msg:
+                    msg = msg["other"]
+
+            # head over to postProcessing
+            return postProcess(msg, namedValues, arguments, None, locale)
+
+        return i18nTranslateFast
+
+    def rebindTranslate(previous=None, *args, **kwargs):
+        # access variables from upper function
+        nonlocal i18n, api, register
+
+        # registered objects keep their bindings, unless bound to an outdated entry point
+        targets = register if type(register) is list else [register]
+        for obj in targets:
+            if type(obj) is dict and obj.get(api["__"]) is previous:
+                obj[api["__"]] = i18n["__"]
+
+    def bindOwner(*args, **kwargs):
+        # access variables from upper function
+        nonlocal i18n, owner
+
+        # each entry point keeps the instance alive, it's torn down once none is reachable
+        instance = owner() if owner is not None else None
+        if instance is not None:
+            for value in list(i18n.values()):
+                if type(value) is FunctionType:
+                    value.owner = instance
+
     def postProcess(
-        msg=None, namedValues=None, arguments=[], count=None, *args, **kwargs
+        msg=None,
+        namedValues=None,
+        arguments=[],
+        count=None,
+        locale=None,
+        cached=True,
+        *args,
+        **kwargs,
     ):
         # access variables from upper function
-        nonlocal mustacheConfig, mustacheRegex
+        nonlocal mustacheRenderer
 
-        # in case msg is None
-        if msg is None:
+        # in case msg is None or not a string at all
+        if type(msg) is not str:
             return msg
 
-        # test for parsable interval string
-        if re.compile(r"\|").search(msg):
-            msg = parsePluralInterval(msg, count)
+        compiled = getCompiledMessage(locale, msg) if cached else compileMessage(msg)
+
+        # pick the phrase of the matching interval
+        if compiled["intervals"] is not None:
+            compiled = selectCompiledInterval(compiled, count)
 
         # replace the counter
-        if type(count) is int:
-            msg = msg % count
+        if isNumber(count) and compiled["printf"]:
+            compiled = countCompiledMessage(compiled, int(count))
+        msg = compiled["msg"]
 
         # if the msg string contains {{Mustache}} patterns we render it as a mini template
-        if not mustacheConfig["disable"] and mustacheRegex.search(msg):
-            pystache.defaults.DELIMITERS = tuple(mustacheConfig["tags"])
-            msg = pystache.render(msg, namedValues, partials={})
+        if compiled["mustache"]:
+            msg = renderCompiledMustache(compiled, namedValues)
 
         # if we have extra arguments with values to get replaced,
         # an additional substition injects those strings afterwards
-        if re.compile(r"%").search(msg) and arguments and len(arguments) > 0:
+        if compiled["printf"] and arguments and len(arguments) > 0:
             msg = msg % tuple(arguments)
 
         return msg
 
+    def getCompiledMessage(locale=None, msg=None, *args, **kwargs):
+        # access variables from upper function
+        nonlocal compiledMessages, messageCacheSize
+
+        cache = compiledMessages.get(locale)
+        if cache is None:
+            cache = compiledMessages.setdefault(locale, OrderedDict())
+
+        compiled = cache.get(msg)
+        if compiled is not None:
+            try:
+                cache.move_to_end(msg)
+            except KeyError:
+                # evicted by a concurrent caller in the meantime
+                pass
+            return compiled
+
+        compiled = compileMessage(msg)
+        cache[msg] = compiled
+        while len(cache) > messageCacheSize:
+            try:
+                cache.popitem(last=False)
+            except KeyError:
+                break
+        return compiled
+
+    def countCompiledMessage(compiled=None, count=None, *args, **kwargs):
+        msg = compiled["msg"] % count
+        counted = {
+            **compiled,
+            "msg": msg,
+            "intervals": None,
+            "printf": "%" in msg,
+            "template": None,
+        }
+        segments = compiled["segments"]
+        if segments is None:
+            return counted
+
+        # the counter sits in the literal segments, substitute it there and keep the lookups
+        literals = [segment for segment in segments if type(segment) is str]
+        text = "\0".join(literals)
+        if "\0" in compiled["msg"] or text.count("%") != compiled["msg"].count("%"):
+            return compileMessage(msg, False)
+        literals = iter((text % count).split("\0"))
+        counted["segments"] = [
+            next(literals) if type(segment) is str else segment for segment in segments
+        ]
+        return counted
+
+    def compileMessage(msg=None, intervals=True, *args, **kwargs):
+        # access variables from upper function
+        nonlocal mustacheConfig, mustacheRegex
+
+        compiled = {
+            "msg": msg,
+            "intervals": None,
+            "mustache": False,
+            "printf": "%" in msg,
+            "segments": None,
+            "template": None,
+        }
+
+        # test for parsable interval string
+        if intervals and "|" in msg:
+            parts = compilePluralInterval(msg)
+            if any(part["rule"] for part in parts):
+                for part in parts:
+                    part["compiled"] = compileMessage(part["phrase"], False)
+                compiled["intervals"] = parts
+                compiled["whole"] = compileMessage(msg, False)
+
+        # test for {{Mustache}} patterns and parse them once
+        if not mustacheConfig["disable"] and mustacheRegex.search(msg):
+            compiled["mustache"] = True
+            # plain variable templates are rendered natively, anything else by pystache
+            compiled["segments"] = compileTemplate(msg, mustacheConfig["tags"])
+            if compiled["segments"] is None:
+                compiled["template"] = parseMustache(msg)
+
+        return compiled
+
+    def renderCompiledMustache(compiled=None, namedValues=None, *args, **kwargs):
+        # access variables from upper function
+        nonlocal mustacheRenderer
+
+        if compiled["segments"] is not None:
+            msg = renderTemplate(compiled["segments"], namedValues)
+            if msg is not None:
+                return msg
+
+        # values the native engine can't resolve exactly are left to pystache
+        if compiled["template"] is None:
+            compiled["template"] = parseMustache(compiled["msg"])
+        return mustacheRenderer.render(compiled["template"], namedValues)
+
+    def parseMustache(msg=None, *args, **kwargs):
+        # access variables from upper function
+        nonlocal mustacheConfig
+
+        # delimiters are passed per instance, pystache.defaults stays untouched
+        return pystache.parse(msg, delimiters=tuple(mustacheConfig["tags"]))
+
+    def selectCompiledInterval(compiled=None, count=None, *args, **kwargs):
+        index = selectPluralInterval(compiled["intervals"], count)
+        if index < 0:
+            return compiled["whole"]
+        return compiled["intervals"][index]["compiled"]
+
+    def getMessageformat(locale=None, pattern=None, *args, **kwargs):
+        # access variables from upper function
+        nonlocal MessageformatInstanceForLocale, messageCacheSize
+
+        instance = MessageformatInstanceForLocale.get(locale)
+        if instance is None:
+            instance = MessageformatInstanceForLocale.setdefault(
+                locale, {"plural": getPlural(locale), "formatters": OrderedDict()}
+            )
+        formatters = instance["formatters"]
+
+        formatter = formatters.get(pattern)
+        if formatter is not None:
+            try:
+                formatters.move_to_end(pattern)
+            except KeyError:
+                # evicted by a concurrent caller in the meantime
+                pass
+            return formatter
+
+        try:
+            formatter = compileMessageformat(pattern, instance["plural"])
+        except ValueError as parseError:
+            logError(f"unable to parse messageformat '{pattern}': {parseError}")
+            formatter = lambda values=None, number=None: pattern
+        formatters[pattern] = formatter
+        while len(formatters) > messageCacheSize:
+            try:
+                formatters.popitem(last=False)
+            except KeyError:
+                break
+        return formatter
+
+    def invalidateCompiledMessages(
+        locale=None, previous=None, diff=None, *args, **kwargs
+    ):
+        # access variables from upper function
+        nonlocal compiledMessages
+
+        if diff is None:
+            compiledMessages.pop(locale, None)
+            return
+
+        # messages are compiled by their text, only texts that are gone can go
+        cache = compiledMessages.get(locale)
+        if cache is not None:
+            for key in [*diff["changed"], *diff["removed"]]:
+                for msg in collectMessages(previous.get(key)):
+                    cache.pop(msg, None)
+
+    def getTranslations(phrase=None, *args, **kwargs):
+        # access variables from upper function
+        nonlocal i18n, pendingLocales, translationIndex, translationLists, indexedLocales, objectNotation
+
+        cached = translationLists.get(phrase) if type(phrase) is str else None
+        if cached is not None:
+            return cached
+
+        # translations of every locale are asked for
+        if pendingLocales:
+            loadPendingLocales()
+
+        # nested and namespaced keys are not part of the index, translate them one by one
+        if (
+            type(phrase) is not str
+            or (objectNotation and objectNotation in phrase)
+            or splitNamespace(phrase)[0] is not None
+        ):
+            return [
+                (locale, i18n["__"]({"phrase": phrase, "locale": locale}))
+                for locale in indexedLocales
+            ]
+
+        values = translationIndex.get(phrase, {})
+        translations = []
+        for locale in indexedLocales:
+            msg = values.get(locale)
+            if msg is None:
+                # missing in this locale, let __ add it like any other miss
+                translations.append(
+                    (locale, i18n["__"]({"phrase": phrase, "locale": locale}))
+                )
+                continue
+            if (type(msg) is dict or type(msg) is list) and "one" in msg:
+                msg = msg["one"]
+            if (type(msg) is dict or type(msg) is list) and "other" in msg:
+                msg = msg["other"]
+            translations.append((locale, postProcess(msg, {}, [], None, locale)))
+        translationLists[phrase] = translations
+        return translations
+
+    def indexLocale(locale=None, previous=None, diff=None, *args, **kwargs):
+        # access variables from upper function
+        nonlocal locales, translationIndex, translationLists, indexedLocales, syncedKeys
+
+        catalog = locales.get(locale)
+
+        # only keys that changed since the previous catalog need an update
+        if diff is not None and isComparable(catalog):
+            for key in diff["removed"]:
+                values = translationIndex.get(key)
+                if values is not None:
+                    values.pop(locale, None)
+                    if not values:
+                        translationIndex.pop(key, None)
+                # a removed key needs to be synced again
+                syncedKeys.discard(key)
+                translationLists.pop(key, None)
+            for key in [*diff["added"], *diff["changed"]]:
+                values = translationIndex.get(key)
+                if type(catalog) is dict or key in catalog.added:
+                    translationIndex.setdefault(key, {})[locale] = catalog[key]
+                elif values is not None:
+                    values.pop(locale, None)
+                    if not values:
+                        translationIndex.pop(key, None)
+                translationLists.pop(key, None)
+            return
+
+        # drop what the previous catalog of this locale contributed
+        for key, value in indexedItems(previous):
+            values = translationIndex.get(key)
+            if values is not None:
+                values.pop(locale, None)
+                if not values:
+                    translationIndex.pop(key, None)
+
+        for key, value in indexedItems(catalog):
+            translationIndex.setdefault(key, {})[locale] = value
+
+        if locale not in indexedLocales:
+            indexedLocales = tuple(sorted([*indexedLocales, locale]))
+            acceptedLanguagesCache.clear()
+            resolvedLocales.clear()
+        translationLists = {}
+
+        # keys may be missing from the new catalog, sync them again
+        syncedKeys = set()
+
+    def indexTranslation(locale=None, key=None, value=None, *args, **kwargs):
+        # access variables from upper function
+        nonlocal translationIndex, translationLists, indexedLocales
+
+        translationIndex.setdefault(key, {})[locale] = value
+        translationLists.pop(key, None)
+        if locale not in indexedLocales:
+            indexedLocales = tuple(sorted([*indexedLocales, locale]))
+            translationLists = {}
+            acceptedLanguagesCache.clear()
+            resolvedLocales.clear()
+
+    def isDottedKey(singular=None, *args, **kwargs):
+        # access variables from upper function
+        nonlocal objectNotation
+
+        # separators at either end don't address a nested key
+        if not objectNotation or type(singular) is not str:
+            return False
+        indexOfDot = singular.rfind(objectNotation)
+        return indexOfDot > 0 and indexOfDot < len(singular) - len(objectNotation)
+
+    def splitNamespace(singular=None, *args, **kwargs):
+        # access variables from upper function
+        nonlocal namespaces, namespaceSeparator
+
+        # only configured namespaces count, so 'Note: text' stays a plain key
+        if not namespaces or type(singular) is not str:
+            return None, singular
+        index = singular.find(namespaceSeparator)
+        if index > 0 and singular[:index] in namespaces:
+            return singular[:index], singular[index + len(namespaceSeparator) :]
+        return None, singular
+
     def argsEndWithNamedObject(arguments=[], *args, **kwargs):
         return (
             len(arguments) > 1
@@ -551,7 +1873,7 @@ def I18n(_OPTS: _OptionType = False):
                 obj[alias] = i18n[method]
 
         # set initial locale if not set
-        if checkValues(obj, "locale"):
+        if not checkValues(obj, "locale"):
             obj["locale"] = defaultLocale
 
         # escape recursion
@@ -595,15 +1917,197 @@ def I18n(_OPTS: _OptionType = False):
         return extensionRegex.sub("", prefixRegex.sub("", filename))
 
     def extractQueryLanguage(queryLanguage, *args, **kwargs):
-        raise NotImplementedError
+        # the last non-empty value wins when given several times
+        if type(queryLanguage) is list:
+            queryLanguage = [lang for lang in queryLanguage if lang]
+            return queryLanguage[-1] if queryLanguage else None
+        return queryLanguage
 
     def guessLanguage(request, *args, **kwargs):
-        raise NotImplementedError
+        # access variables from upper function
+        nonlocal i18n, defaultLocale, languageHeaderName, queryParameter, cookiename, preserveLegacyCase
+
+        if type(request) is dict:
+            headers = request.get("headers")
+            languageHeader = (
+                headers.get(languageHeaderName) if type(headers) is dict else None
+            )
+
+            request["languages"] = [defaultLocale]
+            request["regions"] = [defaultLocale]
+            request["language"] = defaultLocale
+            request["region"] = defaultLocale
+
+            # a query parameter overwrites all
+            if queryParameter and request.get("url"):
+                query = urllib.parse.parse_qs(urllib.parse.urlsplit(str(request["url"])).query)
+                queryLanguage = extractQueryLanguage(query.get(queryParameter))
+                if queryLanguage:
+                    logDebug(f"Overriding locale from query: {queryLanguage}")
+                    if preserveLegacyCase:
+                        queryLanguage = queryLanguage.lower()
+                    request["language"] = queryLanguage
+                    return i18n["setLocale"](request, queryLanguage)
+
+            # a cookie overwrites headers
+            cookies = request.get("cookies")
+            if cookiename and type(cookies) is dict and cookies.get(cookiename):
+                request["language"] = cookies[cookiename]
+                return i18n["setLocale"](request, request["language"])
+
+            # 'accept-language' is the most common source
+            if languageHeader:
+                [language, region, languages, regions] = resolveAcceptedLanguages(
+                    languageHeader
+                )
+                if languages:
+                    request["languages"] = list(languages)
+                if regions:
+                    request["regions"] = list(regions)
+                request["language"] = language or request["language"]
+                request["region"] = region or request["region"]
+                return i18n["setLocale"](request, request["language"])
+
+        # last resort: defaultLocale
+        return i18n["setLocale"](request, defaultLocale)
 
     def getAcceptedLanguagesFromHeader(header, *args, **kwargs):
-        raise NotImplementedError
+        preferences = {}
+        languages = []
+        for item in header.split(","):
+            preferenceParts = item.strip().split(";q=")
+            if not preferenceParts[0]:
+                continue
+            try:
+                quality = float(preferenceParts[1]) if len(preferenceParts) > 1 else 1.0
+            except ValueError:
+                quality = 0.0
+            preferences[preferenceParts[0]] = quality
+            languages.append(preferenceParts[0])
+
+        return sorted(
+            [lang for lang in languages if preferences[lang] > 0],
+            key=lambda lang: -preferences[lang],
+        )
+
+    def resolveAcceptedLanguages(header=None, *args, **kwargs):
+        # access variables from upper function
+        nonlocal locales, fallbacks, acceptedLanguagesCacheSize
+
+        # real traffic only has a few hundred distinct headers
+        resolved = acceptedLanguagesCache.get(header)
+        if resolved is not None:
+            try:
+                acceptedLanguagesCache.move_to_end(header)
+            except KeyError:
+                # evicted by a concurrent caller in the meantime
+                pass
+            return resolved
+
+        match = None
+        fallbackMatch = None
+        fallback = None
+        languages = []
+        regions = []
+        for lang in getAcceptedLanguagesFromHeader(header):
+            lr = lang.split("-")
+            parentLang = lr[0]
+            region = lr[1] if len(lr) > 1 else None
+
+            languages.append(parentLang)
+            if region:
+                regions.append(region)
+
+            # the first language we know, or have a fallback for, wins
+            if isKnownLocale(lang):
+                match = lang
+                break
+
+            # Check if we have a configured fallback set for this language
+            # or for the parent language of the locale.
+            fallback = getFallback(lang, fallbacks) or getFallback(
+                parentLang, fallbacks
+            )
+            if fallback:
+                break
+
+            if not fallbackMatch and isKnownLocale(parentLang):
+                fallbackMatch = parentLang
+
+        resolved = (
+            match or fallback or fallbackMatch,
+            regions[0] if regions else None,
+            tuple(languages),
+            tuple(regions),
+        )
+        acceptedLanguagesCache[header] = resolved
+        while len(acceptedLanguagesCache) > acceptedLanguagesCacheSize:
+            try:
+                acceptedLanguagesCache.popitem(last=False)
+            except KeyError:
+                break
+        return resolved
+
+    def parseCookies(header=None, *args, **kwargs):
+        cookies = http.cookies.SimpleCookie()
+        try:
+            cookies.load(header or "")
+        except http.cookies.CookieError:
+            return {}
+        return {name: morsel.value for name, morsel in cookies.items()}
+
+    def getContextLocale(*args, **kwargs):
+        # access variables from upper function
+        nonlocal contextKey
+
+        contextLocales = _currentLocales.get()
+        return contextLocales.get(contextKey) if contextLocales else None
+
+    def setContextLocale(locale=None, *args, **kwargs):
+        # access variables from upper function
+        nonlocal contextKey
+
+        # copied, so contexts sharing the previous mapping keep their own locale
+        contextLocales = _currentLocales.get()
+        return _currentLocales.set({**(contextLocales or {}), contextKey: locale})
+
+    def resetContextLocale(token=None, *args, **kwargs):
+        # a response closed in another context can't reset, so it restores instead
+        try:
+            _currentLocales.reset(token)
+        except ValueError:
+            _currentLocales.set(
+                None if token.old_value is contextvars.Token.MISSING else token.old_value
+            )
+
+    def bindRequestApi(request=None, *args, **kwargs):
+        # access variables from upper function
+        nonlocal i18n, api
+
+        # translate in the locale of the request, read upon each call
+        def bind(method):
+            def translateInRequestLocale(*args, **kwargs):
+                token = setContextLocale(request.get("locale"))
+                try:
+                    return i18n[method](*args, **kwargs)
+                finally:
+                    resetContextLocale(token)
+
+            return translateInRequestLocale
+
+        for method in ["__", "__n", "__mf", "__l", "__h"]:
+            request[api[method]] = bind(method)
 
     def getLocaleFromObject(obj=None, *args, **kwargs):
+        # access variables from upper function
+        nonlocal i18n, contextLocale, requestLocales
+
+        # locale set in the current thread or asyncio task
+        if (contextLocale or requestLocales) and obj is i18n:
+            locale = getContextLocale()
+            if locale is not None:
+                return locale
+
         locale = None
         if (
             type(obj) is dict
@@ -616,37 +2120,49 @@ def I18n(_OPTS: _OptionType = False):
         return locale
 
     def parsePluralInterval(phrase, count, *args, **kwargs):
-        returnPhrase = phrase
-        phrases = re.split(r"\|", phrase)
-        intervalRuleExists = False
-
-        # some() breaks on 1st true
-        def test(p):
-            # access variables from upper function
-            nonlocal returnPhrase, intervalRuleExists
+        parts = compilePluralInterval(phrase)
+        index = selectPluralInterval(parts, count)
+        return parts[index]["phrase"] if index >= 0 else phrase
 
-            matches = re.search(r"^\s*([()[\]]+[\d,]+[()[\]]+)?\s*(.*)$", p)
+    def compilePluralInterval(phrase, *args, **kwargs):
+        parts = []
+        for p in phrase.split("|"):
+            matches = _INTERVAL_RULE.search(p)
 
             # not the same as in combined condition
             if matches and matches.group(1):
-                intervalRuleExists = True
-                if matchInterval(count, matches.group(1)) == True:
-                    returnPhrase = matches.group(2)
-                    return True
+                parts.append(
+                    {
+                        "rule": True,
+                        "interval": parseInterval(matches.group(1)),
+                        "phrase": matches.group(2),
+                    }
+                )
             else:
-                # this is a other or catch all case, this only is taken into account if there is actually another rule
-                if intervalRuleExists:
-                    returnPhrase = p
-            return False
+                parts.append({"rule": False, "interval": None, "phrase": p})
+        return parts
 
-        for p in phrases:
-            if test(p):
-                break
-        return returnPhrase
+    def selectPluralInterval(parts, count, *args, **kwargs):
+        # -1 stands for the whole phrase
+        index = -1
+        intervalRuleExists = False
+
+        # some() breaks on 1st true
+        for i, part in enumerate(parts):
+            if part["rule"]:
+                intervalRuleExists = True
+                if matchParsedInterval(count, part["interval"]):
+                    return i
+            # this is a other or catch all case, this only is taken into account if there is actually another rule
+            elif intervalRuleExists:
+                index = i
+        return index
 
     def matchInterval(number, interval, *args, **kwargs):
-        interval = parseInterval(interval)
-        if interval and type(number) is int:
+        return matchParsedInterval(number, parseInterval(interval))
+
+    def matchParsedInterval(number, interval, *args, **kwargs):
+        if interval and isNumber(number) and type(number) is not str:
             if interval["from"]["value"] == number:
                 return interval["from"]["included"]
             if interval["to"]["value"] == number:
@@ -658,19 +2174,35 @@ def I18n(_OPTS: _OptionType = False):
             )
         return False
 
+    def getPlural(locale=None, *args, **kwargs):
+        # access variables from upper function
+        nonlocal PluralsForLocale
+
+        # create a new plural function for locale and cache it
+        plural = PluralsForLocale.get(locale)
+        if plural is None:
+            plural = PluralsForLocale[locale] = makePlural(locale)
+        return plural
+
     def translate(
         locale=None,
         singular=None,
         plural=None,
         skipSyncToAllFiles=False,
+        skipWrite=False,
         *args,
         **kwargs,
     ):
         # access variables from upper function
-        nonlocal locales, defaultLocale, retryInDefaultLocale, fallbacks, objectNotation, syncFiles
+        nonlocal locales, defaultLocale, retryInDefaultLocale, fallbacks, objectNotation, syncFiles, frozen
+
+        # keys of a namespace live in their own shard, never synced to the others
+        (namespace, key) = splitNamespace(singular)
+        if namespace is not None:
+            return translateShard(locale, namespace, key, plural)
 
         # add same key to all translations
-        if not skipSyncToAllFiles and syncFiles:
+        if not skipSyncToAllFiles and syncFiles and not frozen:
             syncToAllFiles(singular, plural)
 
         if locale is None:
@@ -679,40 +2211,42 @@ def I18n(_OPTS: _OptionType = False):
             )
             locale = defaultLocale
 
-        # try to get a fallback
+        # try to get a fallback, then the default locale
         if not checkValues(locales, locale):
-            locale = getFallback(locale, fallbacks) or locale
-
-        # attempt to read when defined as valid locale
-        if not checkValues(locales, locale):
-            read(locale)
-
-        # fallback to default when missed
-        if not checkValues(locales, locale):
-            logWarn(
-                f"WARN: Locale {locale} couldn't be read - check the context of the call to $__. Using {defaultLocale} (default) as current locale"
-            )
-
-            locale = defaultLocale
-            read(locale)
+            locale = resolveLocale(locale)
 
         # dotnotaction add on, @todo: factor out
         defaultSingular = singular
         defaultPlural = plural
         if objectNotation:
-            indexOfColon = singular.index(":")
+            indexOfColon = singular.find(":")
             # We compare against 0 instead of -1 because
             # we don't really expect the string to start with ':'.
             if indexOfColon > 0:
-                defaultSingular = singular[indexOfColon + 1]
+                defaultSingular = singular[indexOfColon + 1 :]
                 singular = singular[0:indexOfColon]
             if plural and type(plural) is not int:
-                indexOfColon = plural.index(":")
+                indexOfColon = plural.find(":")
                 if indexOfColon > 0:
-                    defaultPlural = plural[indexOfColon + 1]
+                    defaultPlural = plural[indexOfColon + 1 :]
                     plural = plural[0:indexOfColon]
 
         accessor = localeAccessor(locale, singular)
+
+        # frozen catalogs are shared with forked workers, misses are answered without storing them
+        if frozen:
+            msg = accessor()
+            if msg is not None:
+                return msg
+            if retryInDefaultLocale and locale != defaultLocale:
+                return translate(defaultLocale, singular, plural, True)
+            if plural:
+                return missingKeyFn(
+                    locale,
+                    {"one": defaultSingular or singular, "other": defaultPlural or plural},
+                )
+            return missingKeyFn(locale, defaultSingular or singular)
+
         mutator = localeMutator(locale, singular)
 
         if plural:
@@ -730,7 +2264,8 @@ def I18n(_OPTS: _OptionType = False):
                             "other": defaultPlural or plural,
                         }
                     )
-                write(locale)
+                if not skipWrite:
+                    scheduleWrite(locale)
 
         if accessor() is None:
             # when retryInDefaultLocale is true - try to set default value from defaultLocale
@@ -739,197 +2274,1028 @@ def I18n(_OPTS: _OptionType = False):
                 mutator(translate(defaultLocale, singular, plural, True))
             else:
                 mutator(defaultSingular or singular)
+            if not skipWrite:
+                scheduleWrite(locale)
+
+        return accessor()
+
+    def syncToAllFiles(singular=None, plural=None, *args, **kwargs):
+        # access variables from upper function
+        nonlocal locales, pendingLocales, syncedKeys, objectNotation
+
+        # keys already synced are a no-op
+        if type(singular) is not str or singular in syncedKeys:
+            return
+
+        # look up without the default value of object notation
+        key = singular
+        if objectNotation and singular.find(":") > 0:
+            key = singular[0 : singular.index(":")]
+
+        # add the key where it's missing, then write each of those locales once
+        if pendingLocales:
+            loadPendingLocales()
+        missing = [
+            locale for locale in list(locales) if localeAccessor(locale, key)() is None
+        ]
+        for locale in missing:
+            translate(locale, singular, plural, True, True)
+        for locale in missing:
+            scheduleWrite(locale)
+        syncedKeys.add(singular)
+
+    def localeAccessor(
+        locale=None, singular=None, allowDelayedTraversal=True, *args, **kwargs
+    ):
+        # access variables from upper function
+        nonlocal locales, dottedIndex, objectNotation
+
+        # Bail out on non-existent locales to defend against internal errors.
+        if not checkValues(locales, locale):
+            return lambda *args, **kwargs: None
+
+        # Handle object lookup notation
+        if isDottedKey(singular):
+            # Every level of the locale tree is kept in a flat index, so there is
+            # nothing to traverse; the index is looked up again upon invocation
+            # because a mutation or reload may have replaced it in the meantime.
+            return lambda *args, **kwargs: dottedIndex.get(locale, {}).get(singular)
+        else:
+            # No object notation, just return an accessor that performs array lookup.
+            return (
+                lambda *args, **kwargs: locales[locale][singular]
+                if checkValues(locales[locale], singular)
+                else None
+            )
+
+    def localeMutator(
+        locale=None, singular=None, allowBranching=False, *args, **kwargs
+    ):
+        # access variables from upper function
+        nonlocal locales, dottedIndex, objectNotation, missingKeyFn
+
+        # Bail out on non-existent locales to defend against internal errors.
+        if not checkValues(locales, locale):
+            return lambda *args, **kwargs: None
+
+        # Handle object lookup notation
+        if isDottedKey(singular):
+            # Return the final mutator.
+            def returnAbove(value):
+                # access variables from upper function
+                nonlocal locale, singular
+
+                # The mutator is only invoked on a miss, so it is always allowed
+                # to create the missing branches along the path.
+                value = missingKeyFn(locale, value)
+                path = singular.split(objectNotation)
+                with catalogLock:
+                    if journal:
+                        journalEntries.setdefault(locale, []).append([path, value])
+                    index = dottedIndex.setdefault(locale, {})
+                    obj = locales[locale]
+                    for depth in range(1, len(path)):
+                        # Fix `object` if `object` is not Object.
+                        if type(obj.get(path[depth - 1])) is not dict:
+                            branch = objectNotation.join(path[:depth])
+                            obj[path[depth - 1]] = index[branch] = {}
+                        obj = obj[path[depth - 1]]
+                    obj[path[-1]] = value
+                    indexDotted(index, singular, value, objectNotation)
+                return value
+
+            return returnAbove
+        else:
+            # No object notation, just return a mutator that performs array lookup and changes the value.
+            def returnBelow(value):
+                # access variables from upper function
+                nonlocal locale, singular
+
+                value = missingKeyFn(locale, value)
+                with catalogLock:
+                    if journal:
+                        journalEntries.setdefault(locale, []).append([[singular], value])
+                    locales[locale][singular] = value
+                    if objectNotation:
+                        index = dottedIndex.setdefault(locale, {})
+                        indexDotted(index, singular, value, objectNotation)
+                indexTranslation(locale, singular, value)
+                return value
+
+            return returnBelow
+
+    def translateShard(
+        locale=None, namespace=None, singular=None, plural=None, *args, **kwargs
+    ):
+        # access variables from upper function
+        nonlocal locales, defaultLocale, retryInDefaultLocale, namespaceSeparator, missingKeyFn, frozen, journal, pendingShards, shardJournal
+
+        if locale is None:
+            logWarn(
+                f"WARN: No locale found - check the context of the call to __(). Using {defaultLocale} as current locale"
+            )
+            locale = defaultLocale
+
+        # shards belong to the locale a translation of the main catalog resolves to
+        if not checkValues(locales, locale):
+            locale = resolveLocale(locale)
+
+        # __n('namespace:cat', 3) passes the namespaced key as plural as well
+        if type(plural) is str and plural.startswith(f"{namespace}{namespaceSeparator}"):
+            plural = plural[len(namespace) + len(namespaceSeparator) :]
+
+        catalog = loadShard(locale, namespace)
+        msg = catalog.get(singular)
+        if msg is not None:
+            return msg
+
+        # same as translate(): retry in the default locale, or add the key itself
+        if retryInDefaultLocale and locale != defaultLocale:
+            logDebug(
+                f"Missing {namespace}{namespaceSeparator}{singular} in {locale} retrying in {defaultLocale}"
+            )
+            value = translateShard(defaultLocale, namespace, singular, plural)
+        elif plural:
+            value = {"one": singular, "other": plural}
+        else:
+            value = singular
+        value = missingKeyFn(locale, value)
+        if frozen:
+            return value
+        # written like the main catalogs, right away or by the flusher, maybe journaled
+        key = (locale, namespace)
+        with shardLock:
+            catalog[singular] = value
+            pendingShards[key] = catalog
+            if journal:
+                shardJournal.setdefault(key, []).append([[singular], value])
+        scheduleWrite(key)
+        return value
+
+    def loadShard(locale=None, namespace=None, *args, **kwargs):
+        # access variables from upper function
+        nonlocal shards, shardSizes, shardStats, pendingShards, journalMaxSize, parser
+
+        key = (locale, namespace)
+        with shardLock:
+            catalog = shards.get(key)
+            if catalog is not None:
+                shards.move_to_end(key)
+                return catalog
+            # evicted before its changes were written
+            catalog = pendingShards.get(key)
+            if catalog is not None:
+                shards[key] = catalog
+                shardSizes.setdefault(key, 0)
+                evictShards()
+                return catalog
+
+        # a missing shard is an empty one, until the first miss writes it
+        file = getShardFilePath(locale, namespace)
+        catalog = {}
+        size = 0
+        signature = None
+        journalSize = 0
+        try:
+            stats = os.stat(file)
+            with open(file, "r", encoding="utf-8") as shardFile:
+                content = shardFile.read()
+            size = stats.st_size
+            signature = (stats.st_size, stats.st_mtime_ns)
+            catalog = parser.loads(content)
+            journalSize = replayJournal(file, catalog)
+        except FileNotFoundError:
+            pass
+        except Exception as parseError:
+            logError(
+                f"unable to parse namespace from file (maybe {file} is empty or invalid json?): ",
+                parseError,
+            )
+            # keep it from being overwritten by the next miss
+            blockedRename(file, f"{file}.invalid")
+            catalog = {}
+
+        with shardLock:
+            # a concurrent caller may have loaded it in the meantime
+            catalog = shards.setdefault(key, catalog)
+            shardSizes.setdefault(key, size)
+            shardStats.setdefault(key, signature)
+            shards.move_to_end(key)
+            evictShards()
+        logDebug(f"read namespace {namespace} of {locale} from {file}")
+
+        # fold an oversized journal back into the file
+        if journalSize > journalMaxSize:
+            with shardLock:
+                pendingShards.setdefault(key, catalog)
+            writeShard(locale, namespace)
+        return catalog
+
+    def evictShards(*args, **kwargs):
+        # access variables from upper function
+        nonlocal shards, shardSizes, shardStats, namespaceBudget
+
+        # called with shardLock held, the most recently used shard always stays
+        if namespaceBudget is None:
+            return
+        total = sum(shardSizes.values())
+        while total > namespaceBudget and len(shards) > 1:
+            (key, catalog) = shards.popitem(last=False)
+            total -= shardSizes.pop(key, 0)
+            shardStats.pop(key, None)
+            logDebug(f"evicted namespace {key[1]} of {key[0]}")
+
+    def evictShard(path=None, *args, **kwargs):
+        # access variables from upper function
+        nonlocal shards, shardSizes, shardStats, extension
+
+        # a changed shard is read again on its next use, our own writes are known
+        locale = os.path.basename(os.path.dirname(path))
+        namespace = os.path.basename(path)[: -len(extension or ".json")]
+        key = (locale, namespace)
+        try:
+            stats = os.stat(path)
+            signature = (stats.st_size, stats.st_mtime_ns)
+        except OSError:
+            signature = None
+        with shardLock:
+            if key in shards and shardStats.get(key) != signature:
+                del shards[key]
+                shardSizes.pop(key, None)
+                shardStats.pop(key, None)
+                logDebug(f"dropped namespace {namespace} of {locale}, changed on disk")
+
+    def writeShard(locale=None, namespace=None, *args, **kwargs):
+        # access variables from upper function
+        nonlocal shards, shardSizes, shardStats, pendingShards, shardJournal, directoryPermissions, indent, updateFiles, parser
+
+        # don't write new locale information to disk if updateFiles isn't true
+        if not updateFiles:
+            return
+
+        key = (locale, namespace)
+        with shardLock:
+            catalog = pendingShards.pop(key, None) or shards.get(key)
+            # journaled keys are part of this content now
+            shardJournal.pop(key, None)
+        if catalog is None:
+            return
+
+        target = getShardFilePath(locale, namespace)
+        tmp = f"{target}.tmp"
+        try:
+            if type(directoryPermissions) is int:
+                os.makedirs(
+                    os.path.dirname(target), mode=directoryPermissions, exist_ok=True
+                )
+            else:
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+            with writeLock:
+                with shardLock:
+                    content = parser.dumps(
+                        dict(catalog), ensure_ascii=False, indent=indent
+                    )
+                with open(tmp, "w", encoding="utf-8") as file:
+                    file.write(content)
+                shutil.move(tmp, target)
+                if os.path.exists(f"{target}.journal"):
+                    os.remove(f"{target}.journal")
+                stats = os.stat(target)
+            with shardLock:
+                # our own write is no reason to read the shard again
+                if shards.get(key) is catalog:
+                    shardSizes[key] = stats.st_size
+                    shardStats[key] = (stats.st_size, stats.st_mtime_ns)
+                    evictShards()
+        except Exception as e:
+            logError(
+                f"unexpected error writing files (either {tmp} or {target} are not writeable?): ",
+                e,
+            )
+            with shardLock:
+                pendingShards.setdefault(key, catalog)
+
+    def appendShardJournal(locale=None, namespace=None, *args, **kwargs):
+        # access variables from upper function
+        nonlocal pendingShards, shardJournal, updateFiles, journalMaxSize, parser
+
+        # don't write new locale information to disk if updateFiles isn't true
+        if not updateFiles:
+            return
+
+        # the journal only ever extends an existing file
+        key = (locale, namespace)
+        target = getShardFilePath(locale, namespace)
+        if not os.path.exists(target):
+            return writeShard(locale, namespace)
+
+        journalFile = f"{target}.journal"
+        with writeLock:
+            with shardLock:
+                entries = shardJournal.pop(key, [])
+                catalog = pendingShards.pop(key, None)
+            if not entries:
+                return
+            try:
+                with open(journalFile, "a", encoding="utf-8") as file:
+                    file.write(
+                        "".join(
+                            f"{parser.dumps(entry, ensure_ascii=False)}\n"
+                            for entry in entries
+                        )
+                    )
+                size = os.stat(journalFile).st_size
+            except Exception as e:
+                logError(
+                    f"unexpected error appending to journal (is {journalFile} writeable?): ",
+                    e,
+                )
+                with shardLock:
+                    shardJournal[key] = entries + shardJournal.get(key, [])
+                    if catalog is not None:
+                        pendingShards.setdefault(key, catalog)
+                return
+
+        # compact once the journal grows too large
+        if size > journalMaxSize:
+            logDebug(f"compacting {journalFile} into {target}")
+            with shardLock:
+                if catalog is not None:
+                    pendingShards.setdefault(key, catalog)
+            writeShard(locale, namespace)
+
+    def read(locale=None, *args, **kwargs):
+        # access variables from upper function
+        nonlocal loadTimings
+
+        file = getStorageFilePath(locale)
+        started = time.perf_counter()
+        try:
+            loaded = loadCatalog(locale, file)
+        except Exception as readError:
+            return initializeLocale(locale, file)
+        loadTimings[locale] = time.perf_counter() - started
+        if loaded is not None:
+            publishLoaded(locale, *loaded)
+
+    def readAll(localesToRead=None, *args, **kwargs):
+        # access variables from upper function
+        nonlocal loadWorkers, loadExecutor, loadTimings, parser
+
+        # reading and parsing runs concurrently, publishing one after another
+        processes = None
+        parse = None
+        if loadExecutor == "process":
+            if isinstance(parser, ModuleType):
+                processes = ProcessPoolExecutor(loadWorkers)
+                parse = lambda content: processes.submit(
+                    _parseCatalog, parser.__name__, content
+                ).result()
+            else:
+                logWarn(
+                    "WARN: parsing in processes needs a parser module, using threads instead"
+                )
+
+        def load(locale):
+            started = time.perf_counter()
+            file = getStorageFilePath(locale)
+            try:
+                loaded = loadCatalog(locale, file, parse)
+            except Exception as readError:
+                return file, readError, time.perf_counter() - started
+            return file, loaded, time.perf_counter() - started
+
+        started = time.perf_counter()
+        try:
+            with ThreadPoolExecutor(loadWorkers) as threads:
+                results = list(zip(localesToRead, threads.map(load, localesToRead)))
+        finally:
+            if processes is not None:
+                processes.shutdown()
+        for locale, (file, loaded, seconds) in results:
+            if isinstance(loaded, Exception):
+                initializeLocale(locale, file)
+                continue
+            loadTimings[locale] = seconds
+            logDebug(f"read {file} in {seconds * 1000:.1f}ms")
+            if loaded is not None:
+                publishLoaded(locale, *loaded)
+        logDebug(
+            f"read {len(results)} locales in {(time.perf_counter() - started) * 1000:.1f}ms"
+        )
+
+    def loadCatalog(locale=None, file=None, parse=None, *args, **kwargs):
+        # access variables from upper function
+        nonlocal locales, catalogDigests, binaryCatalog, sharedCatalog, dedupeCatalogs, snapshotCache, parser
+
+        # returns (catalog, digest, journal size), or None when there is nothing
+        # new to publish, shared state is left to the caller
+        # a compiled catalog that is still up to date spares parsing the file
+        if sharedCatalog or binaryCatalog:
+            catalog = (
+                loadSharedCatalog(locale, file)
+                if sharedCatalog
+                else loadBinaryCatalog(file)
+            )
+            if catalog is not None:
+                digest = (catalog.source, getJournalSignature(file))
+                if catalogDigests.get(locale) == digest:
+                    return None
+                return catalog, digest, replayJournal(file, catalog)
+
+        stats = os.stat(file)
+        with open(file, "r", encoding="utf-8") as localeFile:
+            content = localeFile.read()
+
+        # nothing to do when neither the file nor its journal changed
+        digest = (hashContent(content), getJournalSignature(file))
+        if checkValues(locales, locale) and catalogDigests.get(locale) == digest:
+            logDebug(f"skipping unchanged {file}")
+            return None
+
+        def parseContent():
+            # parsing filecontents to locales[locale], unless a snapshot still matches
+            catalog = loadSnapshot(file, stats, digest[0]) if snapshotCache else None
+            if catalog is None:
+                catalog = (parse or parser.loads)(content)
+                if snapshotCache:
+                    writeSnapshot(file, catalog, stats, digest[0])
+            if binaryCatalog:
+                writeBinaryCatalog(file, catalog, stats)
+            return catalog
+
+        try:
+            # identical files are parsed once per process and shared behind an overlay
+            catalog = (
+                acquireCatalog(file, digest[0], parseContent)
+                if dedupeCatalogs
+                else parseContent()
+            )
+            return catalog, digest, replayJournal(file, catalog)
+        except Exception as parseError:
+            logError(
+                f"unable to parse locales from file (maybe {file} is empty or invalid json?): ",
+                parseError,
+            )
+            return None
+
+    def watchFiles(handler=None, *args, **kwargs):
+        # access variables from upper function
+        nonlocal locales, pendingLocales, directory, prefix, extension, pollInterval, namespaces, watchSubscription
+
+        watcher = _FilePoller if pollInterval else _FileWatcher
+        watch = lambda path, handler, prefix, suffixes: (
+            watcher,
+            watcher.subscribe(path, handler, prefix, suffixes, pollInterval)
+            if pollInterval
+            else watcher.subscribe(path, handler, prefix, suffixes),
+        )
+
+        # our own .tmp and .invalid leftovers never reach the handler
+        watchSubscription = [
+            watch(directory, handler, prefix, (extension, f"{extension}.journal"))
+        ]
+
+        # namespace shards of each locale, those without a directory yet aren't watched
+        if namespaces:
+            for locale in [*locales, *pendingLocales]:
+                path = os.path.join(directory, locale)
+                if os.path.isdir(path):
+                    watchSubscription.append(
+                        watch(path, evictShard, "", (extension or ".json",))
+                    )
+
+    def unwatchFiles(*args, **kwargs):
+        # access variables from upper function
+        nonlocal watchSubscription
+
+        if watchSubscription is not None:
+            for watcher, subscription in watchSubscription:
+                watcher.unsubscribe(subscription)
+            watchSubscription = None
+
+    def acquireCatalog(file=None, digest=None, build=None, *args, **kwargs):
+        # access variables from upper function
+        nonlocal parser
+
+        # a different parser may turn the same content into a different catalog
+        source = (
+            os.path.realpath(file),
+            getattr(parser, "__name__", type(parser).__name__),
+            digest,
+        )
+        return openCatalogOverlay(_CatalogRegistry.acquire(source, build), source)
+
+    def releaseCatalogs(*args, **kwargs):
+        # access variables from upper function
+        nonlocal locales
+
+        for catalog in list(locales.values()):
+            if type(catalog) is _CatalogOverlay:
+                _CatalogRegistry.release(catalog.source)
+        releaseSharedCatalogs()
+
+    def publishLoaded(
+        locale=None, catalog=None, digest=None, journalSize=0, *args, **kwargs
+    ):
+        # access variables from upper function
+        nonlocal catalogDigests, journalMaxSize
+
+        publishCatalog(locale, catalog)
+        catalogDigests[locale] = digest
+
+        # fold an oversized journal back into the file
+        if journalSize > journalMaxSize:
             write(locale)
 
-        return accessor()
+    def initializeLocale(locale=None, file=None, *args, **kwargs):
+        # unable to read, so intialize that file
+        # locales[locale] are already set in memory, so no extra read required
+        # or locales[locale] are empty, which initializes an empty locale.json file
+        # since the current invalid locale could exist, we should back it up
+        if os.path.exists(file):
+            logDebug(f"backing up invalid locale {locale} to {file}.invalid")
+            blockedRename(file, f"{file}.invalid")
+
+        logDebug(f"initializing {file}")
+        write(locale)
+
+    def publishCatalog(locale=None, catalog=None, *args, **kwargs):
+        # access variables from upper function
+        nonlocal locales, dottedIndex, indexedLocales, objectNotation, subscribers
+
+        # build what is derived from the catalog off to the side, then swap the
+        # references, so concurrent lookups see either the old or the new one
+        flat = flattenCatalog(catalog, objectNotation) if objectNotation else None
+        with catalogLock:
+            previous = locales.get(locale)
+            previousFlat = dottedIndex.get(locale)
+            locales[locale] = catalog
+            if flat is not None:
+                dottedIndex[locale] = flat
+
+        # the replaced catalog no longer holds its shared one
+        if type(previous) is _CatalogOverlay and previous is not catalog:
+            _CatalogRegistry.release(previous.source)
+
+        # only what actually changed is evicted from derived structures
+        diff = (
+            diffCatalogs(previous, catalog)
+            if isComparable(previous) and locale in indexedLocales
+            else None
+        )
+        invalidateCompiledMessages(locale, previous, diff)
+        indexLocale(locale, previous, diff)
+        if diff is not None and subscribers:
+            # nested catalogs report the dotted paths of changed leaves
+            if flat is not None:
+                diff = diffCatalogs(
+                    collectLeaves(previousFlat or {}), collectLeaves(flat)
+                )
+            if diff["added"] or diff["changed"] or diff["removed"]:
+                notifySubscribers(locale, diff)
+
+    def notifySubscribers(locale=None, diff=None, *args, **kwargs):
+        # access variables from upper function
+        nonlocal subscribers
+
+        for callback in subscribers:
+            try:
+                callback(locale, diff)
+            except Exception as e:
+                logError(f"subscriber failed handling changes of {locale}: {e}")
+
+    def scheduleReload(locale=None, *args, **kwargs):
+        # access variables from upper function
+        nonlocal reloadDelay, reloadTimers
+
+        # one save may fire several events, only the last one triggers a read
+        with reloadLock:
+            timer = reloadTimers.get(locale)
+            if timer is not None:
+                timer.cancel()
+            timer = Timer(reloadDelay, reloadLocale, (locale,))
+            timer.daemon = True
+            reloadTimers[locale] = timer
+            timer.start()
+
+    def reloadLocale(locale=None, *args, **kwargs):
+        # access variables from upper function
+        nonlocal reloadTimers, pendingLocales
+
+        with reloadLock:
+            if reloadTimers.get(locale) is current_thread():
+                del reloadTimers[locale]
+
+        # locales not loaded yet will be read on first access anyway
+        if locale in pendingLocales:
+            return
+        logDebug(f"Auto reloading locale '{locale}'.")
+        read(locale)
+
+    def loadBinaryCatalog(file=None, *args, **kwargs):
+        # access variables from upper function
+        nonlocal parser
+
+        # only usable while it was compiled from the current file
+        try:
+            stats = os.stat(file)
+            with open(f"{file}.bin", "rb") as binaryFile:
+                buffer = mmap.mmap(binaryFile.fileno(), 0, access=mmap.ACCESS_READ)
+            catalog = openMappedCatalog(buffer, parser.loads)
+        except (OSError, ValueError) as e:
+            logDebug(f"not using compiled catalog {file}.bin: {e}")
+            return None
+        if catalog.source != (stats.st_size, stats.st_mtime_ns):
+            logDebug(f"compiled catalog {file}.bin is out of date")
+            return None
+        return catalog
+
+    def getSharedName(locale=None, *args, **kwargs):
+        # access variables from upper function
+        nonlocal sharedCatalog, directory
+
+        # names of shared memory are short on some platforms
+        scope = (
+            sharedCatalog
+            if type(sharedCatalog) is str
+            else os.path.abspath(directory or "")
+        )
+        scopeTag = zlib.crc32(scope.encode("utf-8"))
+        localeTag = zlib.crc32(str(locale).encode("utf-8"))
+        return f"i18n-{scopeTag:08x}-{localeTag:08x}"
+
+    def loadSharedCatalog(locale=None, file=None, *args, **kwargs):
+        name = getSharedName(locale)
+        try:
+            stats = os.stat(file)
+            source = (stats.st_size, stats.st_mtime_ns)
+            lockPath = getSharedLockPath(name, "lock")
+            while True:
+                with open(lockPath, "a") as lockFile:
+                    # attach to what another process already published for this file
+                    fcntl.flock(lockFile, fcntl.LOCK_SH)
+                    if not _isCurrentFile(lockFile, lockPath):
+                        continue
+                    catalog = attachSharedCatalog(name, source)
+                    if catalog is None:
+                        # the first process to get here parses the file for all of them
+                        fcntl.flock(lockFile, fcntl.LOCK_EX)
+                        if not _isCurrentFile(lockFile, lockPath):
+                            continue
+                        catalog = attachSharedCatalog(name, source)
+                        if catalog is None:
+                            catalog = publishSharedCatalog(name, file, stats)
+                            logDebug(
+                                f"published {file} to shared memory generation {catalog.generation}"
+                            )
+                    holdSharedCatalog(locale, name)
+                    return catalog
+        except Exception as e:
+            logDebug(f"not using shared memory for {file}: {e}")
+            return None
+
+    def holdSharedCatalog(locale=None, name=None, *args, **kwargs):
+        # access variables from upper function
+        nonlocal sharedRefs
+
+        # with the lock file held, so the last user can't unlink it meanwhile
+        if locale not in sharedRefs:
+            sharedRefs[locale] = (name, openSharedUsers(name))
+
+    def releaseSharedCatalogs(*args, **kwargs):
+        # access variables from upper function
+        nonlocal sharedRefs
+
+        for locale in list(sharedRefs):
+            held = sharedRefs.pop(locale, None)
+            if held is None:
+                continue
+            (name, users) = held
+            try:
+                releaseSharedCatalog(name, users)
+            except Exception as e:
+                logDebug(f"unable to release shared memory {name}: {e}")
+            finally:
+                users.close()
+
+    def releaseSharedCatalog(name=None, users=None, *args, **kwargs):
+        lockPath = getSharedLockPath(name, "lock")
+        while True:
+            with open(lockPath, "a") as lockFile:
+                # nobody attaches or publishes meanwhile
+                fcntl.flock(lockFile, fcntl.LOCK_EX)
+                if not _isCurrentFile(lockFile, lockPath):
+                    continue
+                # only the last user gets the users file to itself
+                try:
+                    fcntl.flock(users, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    return
+                try:
+                    control = openSharedMemory(name)
+                    (generation, size, mtime) = _SHARED_CONTROL.unpack_from(control.buf)
+                    control.close()
+                    if generation:
+                        unlinkSharedMemory(f"{name}-{generation}")
+                    unlinkSharedMemory(name)
+                except FileNotFoundError:
+                    pass
+                os.remove(getSharedLockPath(name, "users"))
+                os.remove(lockPath)
+                logDebug(f"unlinked shared memory {name}")
+                return
+
+    def attachSharedCatalog(name=None, source=None, *args, **kwargs):
+        # access variables from upper function
+        nonlocal parser
+
+        try:
+            control = openSharedMemory(name)
+        except FileNotFoundError:
+            return None
+        (generation, size, mtime) = _SHARED_CONTROL.unpack_from(control.buf)
+        control.close()
+        if not generation or (size, mtime) != tuple(source):
+            return None
+        try:
+            segment = openSharedMemory(f"{name}-{generation}")
+        except FileNotFoundError:
+            return None
+        catalog = openMappedCatalog(segment.buf, parser.loads)
+        # the mapping lives as long as the catalog
+        catalog.segment = segment
+        catalog.generation = generation
+        return catalog
+
+    def publishSharedCatalog(name=None, file=None, stats=None, *args, **kwargs):
+        # access variables from upper function
+        nonlocal parser
+
+        with open(file, "r", encoding="utf-8") as localeFile:
+            content = compileBinaryCatalog(
+                parser.loads(localeFile.read()),
+                (stats.st_size, stats.st_mtime_ns),
+                lambda value: parser.dumps(value, ensure_ascii=False),
+            )
+        try:
+            control = openSharedMemory(name)
+        except FileNotFoundError:
+            control = openSharedMemory(name, _SHARED_CONTROL.size)
+        (previous, size, mtime) = _SHARED_CONTROL.unpack_from(control.buf)
+
+        # the next generation goes next to the current one, then becomes current
+        generation = previous + 1
+        try:
+            segment = openSharedMemory(f"{name}-{generation}", len(content))
+        except FileExistsError:
+            unlinkSharedMemory(f"{name}-{generation}")
+            segment = openSharedMemory(f"{name}-{generation}", len(content))
+        segment.buf[: len(content)] = content
+        _SHARED_CONTROL.pack_into(
+            control.buf, 0, generation, stats.st_size, stats.st_mtime_ns
+        )
+        control.close()
+
+        # processes still using the old generation keep their mapping
+        if previous:
+            unlinkSharedMemory(f"{name}-{previous}")
+
+        catalog = openMappedCatalog(segment.buf, parser.loads)
+        catalog.segment = segment
+        catalog.generation = generation
+        return catalog
+
+    def writeBinaryCatalog(file=None, catalog=None, stats=None, *args, **kwargs):
+        # access variables from upper function
+        nonlocal parser
+
+        target = f"{file}.bin"
+        tmp = f"{target}.tmp"
+        try:
+            content = compileBinaryCatalog(
+                catalog,
+                (stats.st_size, stats.st_mtime_ns),
+                lambda value: parser.dumps(value, ensure_ascii=False),
+            )
+            with open(tmp, "wb") as binaryFile:
+                binaryFile.write(content)
+            os.replace(tmp, target)
+        except Exception as e:
+            logError(f"unexpected error compiling {file} to {target}: {e}")
+
+    def getSnapshotPath(file=None, *args, **kwargs):
+        # access variables from upper function
+        nonlocal snapshotCache
+
+        # files of different directories may share a cache directory
+        if type(snapshotCache) is str:
+            tag = zlib.crc32(os.path.abspath(file).encode("utf-8"))
+            return os.path.join(
+                snapshotCache, f"{os.path.basename(file)}.{tag:08x}.snapshot"
+            )
+        return f"{file}.snapshot"
+
+    def getSnapshotHeader(stats=None, digest=None, *args, **kwargs):
+        # access variables from upper function
+        nonlocal parser
+
+        # another parser may read the same content differently
+        return (
+            marshal.version,
+            getattr(parser, "__name__", type(parser).__name__),
+            stats.st_size,
+            stats.st_mtime_ns,
+            digest,
+        )
+
+    def loadSnapshot(file=None, stats=None, digest=None, *args, **kwargs):
+        snapshot = getSnapshotPath(file)
+        try:
+            # unmarshalling from memory is a lot faster than from the file object
+            with open(snapshot, "rb") as snapshotFile:
+                content = memoryview(snapshotFile.read())
+            [size] = struct.unpack_from("<I", content)
+            if marshal.loads(content[4 : 4 + size]) != getSnapshotHeader(
+                stats, digest
+            ):
+                logDebug(f"snapshot {snapshot} is out of date")
+                return None
+            return marshal.loads(content[4 + size :])
+        except (OSError, EOFError, ValueError, TypeError, struct.error) as e:
+            logDebug(f"not using snapshot {snapshot}: {e}")
+            return None
+
+    def writeSnapshot(
+        file=None, catalog=None, stats=None, digest=None, *args, **kwargs
+    ):
+        # access variables from upper function
+        nonlocal snapshotCache
+
+        target = getSnapshotPath(file)
+        tmp = f"{target}.tmp"
+        try:
+            header = marshal.dumps(getSnapshotHeader(stats, digest))
+            content = struct.pack("<I", len(header)) + header + marshal.dumps(catalog)
+            if type(snapshotCache) is str:
+                os.makedirs(snapshotCache, exist_ok=True)
+            with open(tmp, "wb") as snapshotFile:
+                snapshotFile.write(content)
+            os.replace(tmp, target)
+        except Exception as e:
+            # snapshots only save parsing, the file stays the source of truth
+            logDebug(f"unable to write snapshot {target}: {e}")
+
+    def getJournalSignature(file=None, *args, **kwargs):
+        try:
+            stats = os.stat(f"{file}.journal")
+        except OSError:
+            return None
+        return (stats.st_size, stats.st_mtime_ns)
 
-    def syncToAllFiles(singular=None, plural=None, *args, **kwargs):
+    def scheduleWrite(locale=None, *args, **kwargs):
         # access variables from upper function
-        nonlocal locales
+        nonlocal updateFiles, flushInterval, flusher, dirtyLocales
 
-        for locale in locales:
-            translate(locale, singular, plural, True)
+        # write right away unless write-behind is enabled
+        if not flushInterval:
+            return writeChanges(locale)
+        if not updateFiles:
+            return
 
-    def localeAccessor(
-        locale=None, singular=None, allowDelayedTraversal=True, *args, **kwargs
-    ):
-        # access variables from upper function
-        nonlocal locales, objectNotation
+        with flushCondition:
+            dirtyLocales.add(locale)
+            if flusher is None or not flusher.is_alive():
+                flusher = Thread(
+                    target=_flushLoop,
+                    args=(
+                        flushCondition,
+                        flushInterval,
+                        weakref.ref(pendingWrites),
+                        weakref.ref(i18nFlush),
+                    ),
+                    name="i18n-flusher",
+                    daemon=True,
+                )
+                flusher.start()
+            flushCondition.notify()
 
-        # Bail out on non-existent locales to defend against internal errors.
-        if not checkValues(locales, locale):
-            return lambda *args, **kwargs: None
+    def pendingWrites(*args, **kwargs):
+        # access variables from upper function
+        nonlocal flusher, dirtyLocales
 
-        # Handle object lookup notation
-        indexOfDot = objectNotation and singular.rindex(objectNotation)
-        if objectNotation and indexOfDot > 0 and indexOfDot < len(singular) - 1:
-            # If delayed traversal wasn't specifically forbidden, it is allowed.
-            # The accessor we're trying to find and which we want to return.
-            accessor = None
-            # An accessor that returns null.
-            nullAccessor = lambda *args, **kwargs: None
-            # Do we need to re-traverse the tree upon invocation of the accessor?
-            reTraverse = False
-
-            # Split the provided term and run the callback for each subterm.
-            def reducer(obj, index):
-                # access variables from upper function
-                nonlocal accessor, nullAccessor, reTraverse, allowDelayedTraversal
-
-                # Make the accessor return null.
-                accessor = nullAccessor
-                # If our current target object (in the locale tree) doesn't exist or
-                # it doesn't have the next subterm as a member...
-                if obj is None or checkValues(obj, index):
-                    # ...remember that we need retraversal (because we didn't find our target).
-                    reTraverse = allowDelayedTraversal
-                    # Return null to avoid deeper iterations.
-                    return None
-                # We can traverse deeper, so we generate an accessor for this current level.
-                accessor = lambda *args, **kwargs: obj[index]
-                # Return a reference to the next deeper level in the locale tree.
-                return obj[index]
-
-            functools.reduce(reducer, singular.split(objectNotation), locales[locale])
-            # Return the requested accessor.
-            # If we need to re-traverse (because we didn't find our target term)
-            # traverse again and return the new result (but don't allow further iterations)
-            # or return the previously found accessor if it was already valid.
-            return (
-                lambda *args, **kwargs: localeAccessor(locale, singular, False)()
-                if reTraverse
-                else accessor()
-            )
-        else:
-            # No object notation, just return an accessor that performs array lookup.
-            return (
-                lambda *args, **kwargs: locales[locale][singular]
-                if checkValues(locales[locale], singular)
-                else None
-            )
+        # asked by the flusher holding flushCondition, None once stopFlusher() replaced it
+        if flusher is not current_thread():
+            return None
+        return bool(dirtyLocales)
 
-    def localeMutator(
-        locale=None, singular=None, allowBranching=False, *args, **kwargs
-    ):
+    def stopFlusher(*args, **kwargs):
         # access variables from upper function
-        nonlocal locales, objectNotation, missingKeyFn
+        nonlocal flusher
 
-        # Bail out on non-existent locales to defend against internal errors.
-        if not checkValues(locales, locale):
-            return lambda *args, **kwargs: None
+        # the thread ends on its own, whatever it had pending is written here
+        with flushCondition:
+            flusher = None
+            flushCondition.notify_all()
+        i18nFlush()
 
-        # Handle object lookup notation
-        indexOfDot = objectNotation and singular.rindex(objectNotation)
-        if objectNotation and indexOfDot > 0 and indexOfDot < len(singular) - 1:
-            # If branching wasn't specifically allowed, disable it.
-            # This will become the function we want to return.
-            accessor = None
-            # An accessor that takes one argument and returns null.
-            nullAccessor = lambda *args, **kwargs: None
-            # Fix object path.
-            fixObject = lambda *args, **kwargs: {}
-            # Are we going to need to re-traverse the tree when the mutator is invoked?
-            reTraverse = False
-
-            # Split the provided term and run the callback for each subterm.
-            def reducer(obj, index):
-                # access variables from upper function
-                nonlocal accessor, nullAccessor, allowBranching, fixObject, reTraverse
-
-                # Make the mutator do nothing.
-                accessor = nullAccessor
-                # If our current target object (in the locale tree) doesn't exist or
-                # it doesn't have the next subterm as a member...
-                if obj is None or not checkValues(obj, index):
-                    # ...check if we're allowed to create new branches.
-                    if allowBranching:
-                        # Fix `object` if `object` is not Object.
-                        if obj is None or type(obj) is not dict:
-                            obj = fixObject()
-                        # If we are allowed to, create a new object along the path.
-                        obj[index] = {}
-                    else:
-                        # If we aren't allowed, remember that we need to re-traverse later on and...
-                        reTraverse = True
-                        # ...return null to make the next iteration bail our early on.
-                        return None
-
-                # Generate a mutator for the current level.
-                def accessor(value):
-                    obj[index] = value
-                    return value
-
-                # Generate a fixer for the current level.
-                def fixObject(*args, **kwargs):
-                    obj[index] = {}
-                    return obj[index]
-
-                # Return a reference to the next deeper level in the locale tree.
-                return obj[index]
-
-            functools.reduce(reducer, singular.split(objectNotation), locales[locale])
+    def writeChanges(locale=None, *args, **kwargs):
+        # access variables from upper function
+        nonlocal journal
 
-            # Return the final mutator.
-            def returnAbove(value):
-                # access variables from upper function
-                nonlocal locale, singular, reTraverse, accessor
+        # namespace shards are scheduled as (locale, namespace)
+        if type(locale) is tuple:
+            if not journal:
+                return writeShard(*locale)
+            return appendShardJournal(*locale)
 
-                # If we need to re-traverse the tree
-                # invoke the search again, but allow branching
-                # this time (because here the mutator is being invoked)
-                # otherwise, just change the value directly.
-                value = missingKeyFn(locale, value)
-                return (
-                    localeMutator(locale, singular, True)(value)
-                    if reTraverse
-                    else accessor(value)
-                )
+        # rewrite the whole file unless new keys are journaled
+        if not journal:
+            return write(locale)
+        return appendJournal(locale)
 
-            return returnAbove
-        else:
-            # No object notation, just return a mutator that performs array lookup and changes the value.
-            def returnBelow(value):
-                # access variables from upper function
-                nonlocal locale, singular
+    def appendJournal(locale=None, *args, **kwargs):
+        # access variables from upper function
+        nonlocal updateFiles, journalEntries, journalMaxSize, catalogDigests, parser
 
-                value = missingKeyFn(locale, value)
-                locales[locale][singular] = value
-                return value
+        # don't write new locale information to disk if updateFiles isn't true
+        if not updateFiles:
+            return
 
-            return returnBelow
+        # the journal only ever extends an existing file
+        target = getStorageFilePath(locale)
+        if not os.path.exists(target):
+            return write(locale)
+
+        journalFile = f"{target}.journal"
+        with writeLock:
+            with catalogLock:
+                entries = journalEntries.pop(locale, [])
+            if not entries:
+                return
+            try:
+                with open(journalFile, "a", encoding="utf-8") as file:
+                    file.write(
+                        "".join(
+                            f"{parser.dumps(entry, ensure_ascii=False)}\n"
+                            for entry in entries
+                        )
+                    )
+                size = os.stat(journalFile).st_size
+                # our own append is no reason to reload the file
+                if checkValues(catalogDigests, locale):
+                    catalogDigests[locale] = (
+                        catalogDigests[locale][0],
+                        getJournalSignature(target),
+                    )
+            except Exception as e:
+                logError(
+                    f"unexpected error appending to journal (is {journalFile} writeable?): ",
+                    e,
+                )
+                with catalogLock:
+                    journalEntries[locale] = entries + journalEntries.get(locale, [])
+                return
 
-    def read(locale=None, *args, **kwargs):
+        # compact once the journal grows too large
+        if size > journalMaxSize:
+            logDebug(f"compacting {journalFile} into {target}")
+            write(locale)
+
+    def replayJournal(file=None, catalog=None, *args, **kwargs):
         # access variables from upper function
-        nonlocal locales, parser
+        nonlocal parser
 
-        localeFile = {}
-        file = getStorageFilePath(locale)
+        # apply journaled keys over the parsed file, returns the journal size
+        journalFile = f"{file}.journal"
         try:
-            with open(file, "r", encoding="utf-8") as localeFile:
-                content = localeFile.read()
+            with open(journalFile, "r", encoding="utf-8") as journalContent:
+                lines = journalContent.readlines()
+        except FileNotFoundError:
+            return 0
+
+        size = 0
+        for line in lines:
+            size += len(line.encode("utf-8"))
+            if not line.strip():
+                continue
             try:
-                # parsing filecontents to locales[locale]
-                locales[locale] = parser.loads(content)
+                [path, value] = parser.loads(line)
+                node = catalog
+                for key in path[:-1]:
+                    if type(node.get(key)) is not dict:
+                        node[key] = {}
+                    node = node[key]
+                node[path[-1]] = value
             except Exception as parseError:
                 logError(
-                    f"unable to parse locales from file (maybe {file} is empty or invalid json?): ",
-                    parseError,
+                    f"unable to replay journal entry from {journalFile}: {parseError}"
                 )
-        except Exception as readError:
-            # unable to read, so intialize that file
-            # locales[locale] are already set in memory, so no extra read required
-            # or locales[locale] are empty, which initializes an empty locale.json file
-            # since the current invalid locale could exist, we should back it up
-            if os.path.exists(file):
-                logDebug(f"backing up invalid locale {locale} to {file}.invalid")
-                blockedRename(file, f"{file}.invalid")
-
-            logDebug(f"initializing {file}")
-            write(locale)
+        return size
 
     def write(locale=None, *args, **kwargs):
         # access variables from upper function
-        nonlocal locales, directory, directoryPermissions, indent, updateFiles, parser
+        nonlocal locales, catalogDigests, directory, directoryPermissions, indent, updateFiles, journalEntries, parser
 
         tmp = None
         target = None
@@ -955,23 +3321,35 @@ def I18n(_OPTS: _OptionType = False):
 
         # first time init has an empty file
         if not checkValues(locales, locale):
-            locales[locale] = {}
+            publishCatalog(locale, {})
 
         # writing to tmp and rename on success
         try:
             target = getStorageFilePath(locale)
             tmp = f"{target}.tmp"
-            with open(tmp, "w", encoding="utf-8") as file:
-                file.write(
-                    parser.dumps(locales[locale], ensure_ascii=False, indent=indent)
-                )
-            stats = os.stat(tmp)
-            if stats.st_file_attributes == stat.FILE_ATTRIBUTE_ARCHIVE:
-                shutil.move(tmp, target)
-            else:
-                logError(
-                    f"unable to write locales to file (either {tmp} or {target} are not writeable?): "
-                )
+            with writeLock:
+                with catalogLock:
+                    catalog = locales[locale]
+                    content = parser.dumps(
+                        catalog if type(catalog) is dict else dict(catalog),
+                        ensure_ascii=False,
+                        indent=indent,
+                    )
+                    # journaled keys are part of this content now
+                    journalEntries.pop(locale, None)
+                with open(tmp, "w", encoding="utf-8") as file:
+                    file.write(content)
+                stats = os.stat(tmp)
+                if stat.S_ISREG(stats.st_mode):
+                    # our own write is no reason to reload the file
+                    catalogDigests[locale] = (hashContent(content), None)
+                    shutil.move(tmp, target)
+                    if os.path.exists(f"{target}.journal"):
+                        os.remove(f"{target}.journal")
+                else:
+                    logError(
+                        f"unable to write locales to file (either {tmp} or {target} are not writeable?): "
+                    )
         except Exception as e:
             logError(
                 f"unexpected error writing files (either {tmp} or {target} are not writeable?): ",
@@ -997,16 +3375,101 @@ def I18n(_OPTS: _OptionType = False):
             logDebug(f"will use {filepath}")
         return filepath
 
+    def getShardFilePath(locale=None, namespace=None, *args, **kwargs):
+        # access variables from upper function
+        nonlocal pathsep, directory, extension
+
+        ext = extension or ".json"
+        return os.path.normpath(
+            f"{directory}{pathsep}{locale}{pathsep}{namespace}{ext}"
+        )
+
     def getFallback(targetLocale=None, fallbacks=None, *args, **kwargs):
-        fallbacks = fallbacks or {}
-        if checkValues(fallbacks, targetLocale):
-            return fallbacks[targetLocale]
-        fallBackLocale = None
-        for key in fallbacks:
-            if re.search(r"^" + key.replace("*", ".*") + r"$", str(targetLocale)):
-                fallBackLocale = fallbacks[key]
-                break
-        return fallBackLocale
+        # access variables from upper function
+        nonlocal fallbackTable
+
+        # the configured map is compiled once, anything else on demand
+        table = fallbackTable
+        if table is None or (
+            fallbacks is not None and fallbacks is not table["source"]
+        ):
+            table = compileFallbacks(fallbacks or {})
+        return matchFallback(table, targetLocale)
+
+    def loadLocale(locale=None, *args, **kwargs):
+        # access variables from upper function
+        nonlocal locales, pendingLocales, loadLocks
+
+        # read a known locale on first access, returns whether it is loaded
+        if checkValues(locales, locale):
+            return True
+        if locale not in pendingLocales:
+            return False
+
+        # concurrent first accesses wait for the same read
+        with loadLock:
+            lock = loadLocks.setdefault(locale, Lock())
+        with lock:
+            if locale in pendingLocales:
+                logDebug(f"loading locale {locale} on first access")
+                read(locale)
+                pendingLocales.discard(locale)
+        return checkValues(locales, locale)
+
+    def loadPendingLocales(*args, **kwargs):
+        # access variables from upper function
+        nonlocal pendingLocales
+
+        for locale in sorted(pendingLocales, key=str):
+            loadLocale(locale)
+
+    def isKnownLocale(locale=None, *args, **kwargs):
+        # access variables from upper function
+        nonlocal locales, pendingLocales
+
+        return checkValues(locales, locale) or locale in pendingLocales
+
+    def resolveLocale(locale=None, *args, **kwargs):
+        # access variables from upper function
+        nonlocal locales, fallbacks, defaultLocale, resolvedLocalesSize
+
+        # requested -> fallback -> defaultLocale, resolved once per requested tag
+        resolved = resolvedLocales.get(locale)
+        if resolved is not None:
+            try:
+                resolvedLocales.move_to_end(locale)
+            except KeyError:
+                # evicted by a concurrent caller in the meantime
+                pass
+            return resolved
+
+        resolved = locale
+        if not loadLocale(resolved):
+            resolved = getFallback(resolved, fallbacks) or resolved
+
+        # attempt to read when defined as valid locale
+        if not loadLocale(resolved):
+            read(resolved)
+
+        # fallback to default when missed
+        if not checkValues(locales, resolved):
+            logWarn(
+                f"WARN: Locale {resolved} couldn't be read - check the context of the call to $__. Using {defaultLocale} (default) as current locale"
+            )
+
+            resolved = defaultLocale
+            if not loadLocale(resolved):
+                read(resolved)
+
+        # only remember chains ending in a loaded locale, new locales clear the memo
+        if checkValues(locales, resolved):
+            resolvedLocales[locale] = resolved
+            while len(resolvedLocales) > resolvedLocalesSize:
+                try:
+                    resolvedLocales.popitem(last=False)
+                except KeyError:
+                    break
+        return resolved
 
     def logDebug(msg=None, *args, **kwargs):
         # access variables from upper function
@@ -1041,14 +3504,83 @@ def I18n(_OPTS: _OptionType = False):
 
     checkValues = lambda obj, *keytypes: _checkValues(obj, *keytypes)
 
-    watchFiles = lambda path, handler: _watch(path, handler)
-
     getArgsList = lambda locals, function: _getArgsList(locals, function)
 
     parseInterval = lambda string: _entry(string)
 
     blockedRename = lambda source, target: _rename(source, target)
 
+    isNumber = lambda value: _isNumber(value)
+
+    toNumber = lambda value: _toNumber(value)
+
+    makePlural = lambda locale: _makePlural(locale)
+
+    compileMessageformat = lambda pattern, plural: _compileMessageformat(
+        pattern, plural
+    )
+
+    compileTemplate = lambda template, tags: _compileTemplate(template, tags)
+
+    renderTemplate = lambda segments, values: _renderTemplate(segments, values)
+
+    compileFallbacks = lambda fallbacks: _compileFallbacks(fallbacks)
+
+    hashContent = lambda content: hashlib.blake2b(
+        content.encode("utf-8"), digest_size=16
+    ).digest()
+
+    openMappedCatalog = lambda buffer, loads: _MappedCatalog(buffer, loads)
+
+    openCatalogOverlay = lambda shared, source: _CatalogOverlay(shared, source)
+
+    # catalogs diffs can walk without decoding anything
+    isComparable = lambda catalog: type(catalog) is dict or type(
+        catalog
+    ) is _CatalogOverlay
+
+    # what a catalog contributes to the reverse index, a shared catalog only the
+    # keys added by this instance, the others are translated when asked for
+    indexedItems = lambda catalog: (
+        catalog.items()
+        if type(catalog) is dict
+        else catalog.added.items()
+        if type(catalog) is _CatalogOverlay
+        else ()
+    )
+
+    openSharedMemory = lambda name, size=0: _openSharedMemory(name, size)
+
+    unlinkSharedMemory = lambda name: _unlinkSharedMemory(name)
+
+    # next to each shared catalog, a lock file to attach or publish under and a
+    # users file every instance holding the catalog keeps a shared lock on
+    getSharedLockPath = lambda name, suffix: os.path.join(
+        tempfile.gettempdir(), f"{name}.{suffix}"
+    )
+
+    openSharedUsers = lambda name: _lockFile(
+        getSharedLockPath(name, "users"), fcntl.LOCK_SH
+    )
+
+    compileBinaryCatalog = lambda catalog, source, dumps: _compileBinaryCatalog(
+        catalog, source, dumps
+    )
+
+    diffCatalogs = lambda previous, catalog: _diffCatalogs(previous, catalog)
+
+    collectLeaves = lambda flat: _collectLeaves(flat)
+
+    collectMessages = lambda value: _collectMessages(value)
+
+    flattenCatalog = lambda catalog, separator: _flattenCatalog(catalog, separator)
+
+    indexDotted = lambda index, path, value, separator: _indexDotted(
+        index, path, value, separator
+    )
+
+    matchFallback = lambda table, locale: _matchFallback(table, locale)
+
     # private variables & functions
 
     def _checkValues(obj, *keytypes):
@@ -1065,56 +3597,6 @@ def I18n(_OPTS: _OptionType = False):
                 return False
         return True
 
-    class _WatchDogFactory(object):
-        __dogs = {}
-
-        @staticmethod
-        def create(dog, path):
-            name = os.path.abspath(path)
-            if name not in _WatchDogFactory.__dogs:
-                _WatchDogFactory.__dogs[name] = {"mutex": Lock(), "observer": dog}
-
-        @staticmethod
-        def delete(path):
-            name = os.path.abspath(path)
-            if name in _WatchDogFactory.__dogs:
-                _WatchDogFactory.__dogs[name]["observer"].stop()
-                del _WatchDogFactory.__dogs[name]
-
-        @staticmethod
-        def obtainMutex(path):
-            name = os.path.abspath(path)
-            if name not in _WatchDogFactory.__dogs:
-                raise
-            return _WatchDogFactory.__dogs[name]["mutex"]
-
-        @staticmethod
-        def obtainDog(path):
-            name = os.path.abspath(path)
-            if name not in _WatchDogFactory.__dogs:
-                raise
-            return _WatchDogFactory.__dogs[name]["observer"]
-
-    class _EventHandler(FileSystemEventHandler):
-        def __init__(self, handler, path):
-            self.path = os.path.abspath(path)
-            self.handler = handler
-
-        def on_any_event(self, event):
-            if _WatchDogFactory.obtainMutex(self.path).acquire(
-                blocking=True, timeout=1
-            ):
-                self.handler(event)
-                _WatchDogFactory.obtainMutex(self.path).release()
-            return super().on_any_event(event)
-
-    def _watch(path, handler):
-        handler = _EventHandler(handler, path)
-        observer = Observer()
-        _WatchDogFactory.create(observer, path)
-        observer.schedule(handler, path)
-        observer.start()
-
     def _getArgsList(locals, function):
         result = []
         for key in inspect.signature(function).parameters.keys():
@@ -1127,11 +3609,236 @@ def I18n(_OPTS: _OptionType = False):
                 result.append(value)
         return result
 
+    # compiled catalog: header, open addressing table of slots, then the pool
+    # of utf-8 keys and tagged values ('s' strings, 'j' anything else as json)
+    _CATALOG_MAGIC = b"I18NCAT1"
+    _CATALOG_HEADER = struct.Struct("<8sQqII")
+    _CATALOG_SLOT = struct.Struct("<IIIII")
+
+    # shared catalog: a control block with the current generation and the source
+    # size/mtime, each generation is a compiled catalog in its own segment
+    _SHARED_CONTROL = struct.Struct("<QQq")
+
+    class _MappedCatalog(object):
+        def __init__(self, buffer, loads):
+            if len(buffer) < _CATALOG_HEADER.size:
+                raise ValueError("not a compiled catalog")
+            (magic, size, mtime, count, slots) = _CATALOG_HEADER.unpack_from(buffer, 0)
+            if magic != _CATALOG_MAGIC or len(buffer) < _CATALOG_HEADER.size + (
+                slots * _CATALOG_SLOT.size
+            ):
+                raise ValueError("not a compiled catalog")
+            self.buffer = buffer
+            self.loads = loads
+            self.source = (size, mtime)
+            self.count = count
+            self.mask = slots - 1
+            # decoded entries, including keys added at runtime
+            self.decoded = {}
+            self.added = []
+
+        def find(self, key):
+            encoded = str(key).encode("utf-8")
+            hashed = zlib.crc32(encoded)
+            slot = hashed & self.mask
+            while True:
+                entry = _CATALOG_SLOT.unpack_from(
+                    self.buffer, _CATALOG_HEADER.size + slot * _CATALOG_SLOT.size
+                )
+                if not entry[1]:
+                    return None
+                if (
+                    entry[0] == hashed
+                    and self.buffer[entry[1] : entry[1] + entry[2]] == encoded
+                ):
+                    return entry
+                slot = (slot + 1) & self.mask
+
+        def get(self, key, default=None):
+            try:
+                return self.decoded[key]
+            except KeyError:
+                entry = self.find(key)
+            if entry is None:
+                return default
+            value = self.buffer[entry[3] : entry[3] + entry[4]]
+            if value[:1] == b"s":
+                value = str(value[1:], "utf-8")
+            else:
+                value = self.loads(str(value[1:], "utf-8"))
+            self.decoded[key] = value
+            return value
+
+        def keys(self):
+            for slot in range(self.mask + 1):
+                entry = _CATALOG_SLOT.unpack_from(
+                    self.buffer, _CATALOG_HEADER.size + slot * _CATALOG_SLOT.size
+                )
+                if entry[1]:
+                    yield str(self.buffer[entry[1] : entry[1] + entry[2]], "utf-8")
+            yield from list(self.added)
+
+        def items(self):
+            for key in self.keys():
+                yield key, self[key]
+
+        def __getitem__(self, key):
+            value = self.get(key, self)
+            if value is self:
+                raise KeyError(key)
+            return value
+
+        def __setitem__(self, key, value):
+            if key not in self:
+                self.added.append(key)
+            self.decoded[key] = value
+
+        def __contains__(self, key):
+            return key in self.decoded or self.find(key) is not None
+
+        def __iter__(self):
+            return self.keys()
+
+        def __len__(self):
+            return self.count + len(self.added)
+
+    class _ClosingResponse(object):
+        def __init__(self, response, callback):
+            self.response = response
+            self.callback = callback
+
+        def __iter__(self):
+            return iter(self.response)
+
+        def close(self):
+            try:
+                if hasattr(self.response, "close"):
+                    self.response.close()
+            finally:
+                self.callback()
+
+    class _CatalogOverlay(object):
+        def __init__(self, shared, source):
+            self.shared = shared
+            self.source = source
+            # keys added by this instance, the shared catalog is never written to
+            self.added = {}
+
+        def get(self, key, default=None):
+            if key in self.added:
+                return self.added[key]
+            return self.shared.get(key, default)
+
+        def keys(self):
+            yield from self.shared.keys()
+            yield from [key for key in self.added if key not in self.shared]
+
+        def items(self):
+            for key in self.keys():
+                yield key, self[key]
+
+        def __getitem__(self, key):
+            if key in self.added:
+                return self.added[key]
+            return self.shared[key]
+
+        def __setitem__(self, key, value):
+            self.added[key] = value
+
+        def __contains__(self, key):
+            return key in self.added or key in self.shared
+
+        def __iter__(self):
+            return self.keys()
+
+        def __len__(self):
+            return len(self.shared) + len(
+                [key for key in self.added if key not in self.shared]
+            )
+
+    def _openSharedMemory(name, size=0):
+        # segments outlive the process creating them, keep the tracker off them
+        try:
+            return shared_memory.SharedMemory(name, size > 0, size, track=False)
+        except TypeError:
+            segment = shared_memory.SharedMemory(name, size > 0, size)
+            resource_tracker.unregister(segment._name, "shared_memory")
+            return segment
+
+    def _unlinkSharedMemory(name):
+        # unlinking unregisters, so it goes through a tracked handle
+        try:
+            segment = shared_memory.SharedMemory(name)
+        except FileNotFoundError:
+            return
+        segment.close()
+        segment.unlink()
+
+    def _lockFile(path, operation):
+        file = open(path, "a")
+        try:
+            fcntl.flock(file, operation)
+        except Exception:
+            file.close()
+            raise
+        return file
+
+    def _isCurrentFile(file, path):
+        # the last user unlinks the lock files, a waiter may have locked a stale one
+        try:
+            current = os.stat(path)
+        except FileNotFoundError:
+            return False
+        opened = os.fstat(file.fileno())
+        return (opened.st_dev, opened.st_ino) == (current.st_dev, current.st_ino)
+
+    def _compileBinaryCatalog(catalog, source, dumps):
+        entries = [
+            (
+                str(key).encode("utf-8"),
+                b"s" + value.encode("utf-8")
+                if type(value) is str
+                else b"j" + dumps(value).encode("utf-8"),
+            )
+            for key, value in catalog.items()
+        ]
+
+        # keep the table at most half full, so probing stays short
+        slots = 8
+        while slots < len(entries) * 2:
+            slots <<= 1
+        table = bytearray(slots * _CATALOG_SLOT.size)
+        pool = bytearray()
+        base = _CATALOG_HEADER.size + len(table)
+        for key, value in entries:
+            hashed = zlib.crc32(key)
+            slot = hashed & (slots - 1)
+            while _CATALOG_SLOT.unpack_from(table, slot * _CATALOG_SLOT.size)[1]:
+                slot = (slot + 1) & (slots - 1)
+            offset = base + len(pool)
+            _CATALOG_SLOT.pack_into(
+                table,
+                slot * _CATALOG_SLOT.size,
+                hashed,
+                offset,
+                len(key),
+                offset + len(key),
+                len(value),
+            )
+            pool += key
+            pool += value
+        header = _CATALOG_HEADER.pack(
+            _CATALOG_MAGIC, source[0], source[1], len(entries), slots
+        )
+        return header + table + pool
+
+    _INTERVAL_RULE = re.compile(r"^\s*([()[\]]+[\d,]+[()[\]]+)?\s*(.*)$")
+
     _patternParts = {
-        "value": "[-+]?(?:inf|\[[0-9]*\.?\d*(?:[eE][-+]?\d+)?)",
-        "leftBrace": "[\(\]\[]",
-        "delimeter": ",",
-        "rightBrace": "[\)\]\[]",
+        "value": r"[-+]?(?:inf|[0-9]*\.?\d*(?:[eE][-+]?\d+)?)",
+        "leftBrace": r"[\(\]\[]",
+        "delimeter": r",",
+        "rightBrace": r"[\)\]\[]",
     }
 
     _PATTERN = re.compile(
@@ -1164,7 +3871,7 @@ def I18n(_OPTS: _OptionType = False):
 
     def _convert(string):
         try:
-            return eval(str(string)).real
+            return float(string)
         except:
             return math.nan
 
@@ -1209,6 +3916,645 @@ def I18n(_OPTS: _OptionType = False):
             return None
         return interval
 
+    _MISSING = object()
+
+    def _compileTemplate(template, tags):
+        # split a variable-only mustache template into literals and (escape, path) lookups,
+        # return None for sections, partials, comments, delimiter changes or broken tags
+        [start, end] = tags
+        segments = []
+        position = 0
+        while True:
+            left = template.find(start, position)
+            if left < 0:
+                if position < len(template):
+                    segments.append(template[position:])
+                return segments
+            if left > position:
+                segments.append(template[position:left])
+            right = template.find(end, left + len(start))
+            if right < 0:
+                return None
+            tag = template[left + len(start) : right].strip()
+            position = right + len(end)
+            escape = True
+            if tag.startswith("&"):
+                escape = False
+                tag = tag[1:].strip()
+            elif tag.startswith("{"):
+                # triple mustache, closed by an extra brace
+                if not template.startswith("}", position):
+                    return None
+                escape = False
+                tag = tag[1:].strip()
+                position += 1
+            if not tag or tag[0] in "#^/>!=<$&{}" or re.search(r"[\s{}]", tag):
+                return None
+            path = tuple(tag.split("."))
+            if not all(path):
+                return None
+            segments.append((escape, path))
+
+    def _renderTemplate(segments, values):
+        # render compiled segments with plain dict values, None when pystache is needed
+        if type(values) is not dict:
+            return None
+        result = []
+        for segment in segments:
+            if type(segment) is str:
+                result.append(segment)
+                continue
+            escape, path = segment
+            value = values
+            for key in path:
+                if type(value) is not dict:
+                    return None
+                value = value.get(key, _MISSING)
+                if value is _MISSING:
+                    value = ""
+                    break
+            if type(value) is not str:
+                if value is None or type(value) in (bool, int, float):
+                    value = str(value)
+                else:
+                    return None
+            result.append(html.escape(value, quote=True) if escape else value)
+        return "".join(result)
+
+    _NUMBER = re.compile(r"^-?(?:0|[1-9]\d*)(?:\.\d*[1-9])?$")
+
+    def _flattenCatalog(catalog, separator, prefix=None, flat=None):
+        flat = {} if flat is None else flat
+        stack = [(prefix, catalog)]
+        while stack:
+            path, node = stack.pop()
+            for key, value in node.items():
+                dotted = key if path is None else f"{path}{separator}{key}"
+                flat[dotted] = value
+                if type(value) is dict:
+                    stack.append((dotted, value))
+        return flat
+
+    def _diffCatalogs(previous, catalog):
+        return {
+            "added": [key for key in catalog if key not in previous],
+            "changed": [
+                key
+                for key, value in catalog.items()
+                if key in previous and previous[key] != value
+            ],
+            "removed": [key for key in previous if key not in catalog],
+        }
+
+    def _collectLeaves(flat):
+        return {
+            key: value
+            for key, value in flat.items()
+            if type(value) is not dict or not value
+        }
+
+    def _collectMessages(value):
+        if type(value) is str:
+            return [value]
+        if type(value) is dict:
+            return [msg for item in value.values() for msg in _collectMessages(item)]
+        if type(value) is list:
+            return [msg for item in value for msg in _collectMessages(item)]
+        return []
+
+    def _indexDotted(index, path, value, separator):
+        # a replaced branch takes everything indexed below it along
+        if type(index.get(path)) is dict:
+            prefix = f"{path}{separator}"
+            for key in [key for key in index if key.startswith(prefix)]:
+                del index[key]
+        index[path] = value
+        if type(value) is dict:
+            _flattenCatalog(value, separator, path, index)
+
+    def _compileFallbacks(fallbacks):
+        exact = {}
+        trie = {}
+        patterns = []
+        for order, key in enumerate(fallbacks):
+            target = fallbacks[key]
+            prefix = str(key)[:-1]
+            if "*" not in str(key):
+                exact[key] = target
+            elif str(key).endswith("*") and not re.search(
+                r"[.*+?^${}()|[\]\\]", prefix
+            ):
+                # plain wildcards like 'de-*' only need a walk along the tag
+                node = trie
+                for char in prefix:
+                    node = node.setdefault(char, {})
+                node.setdefault("", (order, target))
+            else:
+                pattern = re.compile(r"^" + str(key).replace("*", ".*") + r"$")
+                patterns.append((order, pattern, target))
+        return {"source": fallbacks, "exact": exact, "trie": trie, "patterns": patterns}
+
+    def _matchFallback(table, locale):
+        if locale in table["exact"]:
+            return table["exact"][locale]
+        locale = str(locale)
+
+        # the first matching key in configuration order wins
+        node = table["trie"]
+        match = node.get("")
+        for char in locale:
+            node = node.get(char)
+            if node is None:
+                break
+            if "" in node and (match is None or node[""][0] < match[0]):
+                match = node[""]
+        for order, pattern, target in table["patterns"]:
+            if match is not None and order > match[0]:
+                break
+            if pattern.search(locale):
+                match = (order, target)
+                break
+        return match[1] if match is not None else None
+
+    def _isNumber(value):
+        if type(value) is int or type(value) is float:
+            return value == value
+        return type(value) is str and _NUMBER.search(value) is not None
+
+    def _toNumber(value):
+        if type(value) is int or type(value) is float:
+            return value
+        if type(value) is str:
+            try:
+                number = float(value.strip())
+            except ValueError:
+                return None
+            return int(number) if number.is_integer() else number
+        return None
+
+    # CLDR cardinal plural rules over the operands
+    # n (absolute value), i (integer digits), v (count of visible fraction digits),
+    # f (visible fraction digits) and t (visible fraction digits without trailing zeros)
+    _PLURAL_RULES = {
+        "other": lambda n, i, v, f, t: "other",
+        "one_i1v0": lambda n, i, v, f, t: "one" if i == 1 and v == 0 else "other",
+        "one_n1": lambda n, i, v, f, t: "one" if n == 1 else "other",
+        "one_n01": lambda n, i, v, f, t: "one" if n in (0, 1) else "other",
+        "one_i01": lambda n, i, v, f, t: "one" if i in (0, 1) else "other",
+        "one_i0n1": lambda n, i, v, f, t: "one" if i == 0 or n == 1 else "other",
+        "fr": lambda n, i, v, f, t: "one"
+        if i in (0, 1)
+        else "many"
+        if i != 0 and i % 1000000 == 0 and v == 0
+        else "other",
+        "pt": lambda n, i, v, f, t: "one"
+        if i in (0, 1)
+        else "many"
+        if i != 0 and i % 1000000 == 0 and v == 0
+        else "other",
+        "es": lambda n, i, v, f, t: "one"
+        if n == 1
+        else "many"
+        if i != 0 and i % 1000000 == 0 and v == 0
+        else "other",
+        "it": lambda n, i, v, f, t: "one"
+        if i == 1 and v == 0
+        else "many"
+        if i != 0 and i % 1000000 == 0 and v == 0
+        else "other",
+        "da": lambda n, i, v, f, t: "one"
+        if n == 1 or t != 0 and i in (0, 1)
+        else "other",
+        "is": lambda n, i, v, f, t: "one"
+        if t == 0 and i % 10 == 1 and i % 100 != 11 or t != 0
+        else "other",
+        "si": lambda n, i, v, f, t: "one"
+        if n in (0, 1) or i == 0 and f == 1
+        else "other",
+        "fil": lambda n, i, v, f, t: "one"
+        if v == 0
+        and (i in (1, 2, 3) or i % 10 not in (4, 6, 9))
+        or v != 0
+        and f % 10 not in (4, 6, 9)
+        else "other",
+        "ru": lambda n, i, v, f, t: "other"
+        if v != 0
+        else "one"
+        if i % 10 == 1 and i % 100 != 11
+        else "few"
+        if i % 10 in (2, 3, 4) and i % 100 not in (12, 13, 14)
+        else "many",
+        "be": lambda n, i, v, f, t: "one"
+        if n % 10 == 1 and n % 100 != 11
+        else "few"
+        if n % 10 in (2, 3, 4) and n % 100 not in (12, 13, 14)
+        else "many"
+        if n % 10 in (0, 5, 6, 7, 8, 9) or n % 100 in (11, 12, 13, 14)
+        else "other",
+        "pl": lambda n, i, v, f, t: "other"
+        if v != 0
+        else "one"
+        if i == 1
+        else "few"
+        if i % 10 in (2, 3, 4) and i % 100 not in (12, 13, 14)
+        else "many",
+        "cs": lambda n, i, v, f, t: "many"
+        if v != 0
+        else "one"
+        if i == 1
+        else "few"
+        if i in (2, 3, 4)
+        else "other",
+        "hr": lambda n, i, v, f, t: "one"
+        if v == 0
+        and i % 10 == 1
+        and i % 100 != 11
+        or f % 10 == 1
+        and f % 100 != 11
+        else "few"
+        if v == 0
+        and i % 10 in (2, 3, 4)
+        and i % 100 not in (12, 13, 14)
+        or f % 10 in (2, 3, 4)
+        and f % 100 not in (12, 13, 14)
+        else "other",
+        "mk": lambda n, i, v, f, t: "one"
+        if v == 0 and i % 10 == 1 and i % 100 != 11 or f % 10 == 1 and f % 100 != 11
+        else "other",
+        "sl": lambda n, i, v, f, t: "few"
+        if v != 0
+        else "one"
+        if i % 100 == 1
+        else "two"
+        if i % 100 == 2
+        else "few"
+        if i % 100 in (3, 4)
+        else "other",
+        "lt": lambda n, i, v, f, t: "many"
+        if f != 0
+        else "one"
+        if n % 10 == 1 and n % 100 not in range(11, 20)
+        else "few"
+        if n % 10 in range(2, 10) and n % 100 not in range(11, 20)
+        else "other",
+        "lv": lambda n, i, v, f, t: "zero"
+        if n % 10 == 0 or n % 100 in range(11, 20) or v == 2 and f % 100 in range(11, 20)
+        else "one"
+        if n % 10 == 1
+        and n % 100 != 11
+        or v == 2
+        and f % 10 == 1
+        and f % 100 != 11
+        or v != 2
+        and f % 10 == 1
+        else "other",
+        "ro": lambda n, i, v, f, t: "one"
+        if i == 1 and v == 0
+        else "few"
+        if v != 0 or n == 0 or n % 100 in range(2, 20)
+        else "other",
+        "ar": lambda n, i, v, f, t: "zero"
+        if n == 0
+        else "one"
+        if n == 1
+        else "two"
+        if n == 2
+        else "few"
+        if n % 100 in range(3, 11)
+        else "many"
+        if n % 100 in range(11, 100)
+        else "other",
+        "he": lambda n, i, v, f, t: "one"
+        if i == 1 and v == 0
+        else "two"
+        if i == 2 and v == 0
+        else "many"
+        if v == 0 and n not in range(0, 11) and n % 10 == 0
+        else "other",
+        "ga": lambda n, i, v, f, t: "one"
+        if n == 1
+        else "two"
+        if n == 2
+        else "few"
+        if n in range(3, 7)
+        else "many"
+        if n in range(7, 11)
+        else "other",
+        "gd": lambda n, i, v, f, t: "one"
+        if n in (1, 11)
+        else "two"
+        if n in (2, 12)
+        else "few"
+        if n in range(3, 11) or n in range(13, 20)
+        else "other",
+        "cy": lambda n, i, v, f, t: "zero"
+        if n == 0
+        else "one"
+        if n == 1
+        else "two"
+        if n == 2
+        else "few"
+        if n == 3
+        else "many"
+        if n == 6
+        else "other",
+        "mt": lambda n, i, v, f, t: "one"
+        if n == 1
+        else "few"
+        if n == 0 or n % 100 in range(2, 11)
+        else "many"
+        if n % 100 in range(11, 20)
+        else "other",
+        "two": lambda n, i, v, f, t: "one"
+        if n == 1
+        else "two"
+        if n == 2
+        else "other",
+        "ksh": lambda n, i, v, f, t: "zero"
+        if n == 0
+        else "one"
+        if n == 1
+        else "other",
+        "lag": lambda n, i, v, f, t: "zero"
+        if n == 0
+        else "one"
+        if i in (0, 1)
+        else "other",
+    }
+
+    _PLURAL_LANGUAGES = {
+        "other": "bm bo dz id ig ii in ja jbo jv jw kde kea km ko lo ms my nqo osa sah ses sg su th to vi wo yo yue zh",
+        "one_i1v0": "ast de en et fi fy gl ia io ji lij nl sc scn sv sw ur yi",
+        "one_n1": "af an asa az bal bem bez bg brx ce cgg chr ckb dv ee el eo eu fo fur gsw ha haw hu jgo jmc ka kaj kcg kk kkj kl ks ksb ku ky lb lg mas mgo ml mn mr nah nb nd ne nn nnh no nr ny nyn om or os pap ps rm rof rwk saq sd sdh seh sn so sq ss ssy st syr ta te teo tig tk tn tr ts ug uz ve vo vun wae xh xog",
+        "one_n01": "ak bho guw ln mg nso pa ti wa",
+        "one_i01": "ff hy kab",
+        "one_i0n1": "am as bn doi fa gu hi kn pcm zu",
+        "fr": "fr",
+        "pt": "pt",
+        "es": "es",
+        "it": "ca it vec",
+        "da": "da",
+        "is": "is",
+        "si": "si",
+        "fil": "fil tl",
+        "ru": "ru uk",
+        "be": "be",
+        "pl": "pl",
+        "cs": "cs sk",
+        "hr": "bs hr sh sr",
+        "mk": "mk",
+        "sl": "sl",
+        "lt": "lt",
+        "lv": "lv prg",
+        "ro": "mo ro",
+        "ar": "ar ars",
+        "he": "he iw",
+        "ga": "ga",
+        "gd": "gd",
+        "cy": "cy",
+        "mt": "mt",
+        "two": "iu naq sat se sma smi smj smn sms",
+        "ksh": "ksh",
+        "lag": "lag",
+    }
+
+    _PLURAL_RULE_FOR_LANGUAGE = {
+        language: _PLURAL_RULES[rule]
+        for rule, languages in _PLURAL_LANGUAGES.items()
+        for language in languages.split()
+    }
+    _PLURAL_RULE_FOR_LANGUAGE["pt-pt"] = _PLURAL_RULES["it"]
+
+    def _pluralOperands(number):
+        string = repr(abs(number)) if type(number) is float else str(number).strip()
+        string = string.lstrip("-")
+        if "e" in string.lower():
+            string = format(abs(float(number)), "f").rstrip("0").rstrip(".")
+        integer, _, fraction = string.partition(".")
+        i = int(integer or 0)
+        v = len(fraction)
+        f = int(fraction) if fraction else 0
+        t = int(fraction.rstrip("0") or 0)
+        return (i if v == 0 else abs(float(string)), i, v, f, t)
+
+    def _makePlural(locale):
+        # split locales with a region code, prefer the full locale, fallback to the language
+        parts = [part for part in re.split(r"[_\-\s]+", str(locale).lower()) if part]
+        rule = _PLURAL_RULE_FOR_LANGUAGE.get("-".join(parts)) or (
+            _PLURAL_RULE_FOR_LANGUAGE.get(parts[0]) if parts else None
+        )
+        rule = rule or _PLURAL_RULES["other"]
+
+        def plural(count):
+            # integral floats count like integers, as numbers do in i18n-node
+            if type(count) is float and count.is_integer():
+                count = int(count)
+            if type(count) is int:
+                n = -count if count < 0 else count
+                return rule(n, n, 0, 0, 0)
+            if not isNumber(count):
+                return "other"
+            return rule(*_pluralOperands(count))
+
+        return plural
+
+    def _compileMessageformat(pattern, plural):
+        # parse an ICU MessageFormat pattern into a tree of closures,
+        # every node is called like formatter(values, number), number being the nearest plural value
+        position, parts = _mfParseMessage(pattern, 0, plural, False)
+        if position < len(pattern):
+            raise ValueError(f"unexpected '}}' at {position}")
+        return _mfJoin(parts)
+
+    def _mfJoin(parts):
+        if not parts:
+            return lambda values=None, number=None: ""
+        if len(parts) == 1 and type(parts[0]) is str:
+            text = parts[0]
+            return lambda values=None, number=None: text
+        if len(parts) == 1:
+            return parts[0]
+
+        def formatter(values=None, number=None):
+            return "".join(
+                part if type(part) is str else part(values, number) for part in parts
+            )
+
+        return formatter
+
+    def _mfParseMessage(pattern, position, plural, inPlural):
+        # returns the position of the closing '}' (or the end) and the message parts
+        parts = []
+        literal = []
+        length = len(pattern)
+        while position < length:
+            char = pattern[position]
+            if char == "'":
+                following = pattern[position + 1 : position + 2]
+                if following == "'":
+                    literal.append("'")
+                    position += 2
+                    continue
+                if following in ("{", "}") or (inPlural and following == "#"):
+                    # quoted literal up to the next single apostrophe
+                    position += 1
+                    while position < length:
+                        if pattern[position] == "'":
+                            if pattern[position + 1 : position + 2] == "'":
+                                literal.append("'")
+                                position += 2
+                                continue
+                            break
+                        literal.append(pattern[position])
+                        position += 1
+                    position += 1
+                    continue
+                literal.append(char)
+            elif char == "{":
+                if literal:
+                    parts.append("".join(literal))
+                    literal = []
+                position, part = _mfParseArgument(pattern, position + 1, plural, inPlural)
+                parts.append(part)
+                continue
+            elif char == "}":
+                break
+            elif char == "#" and inPlural:
+                if literal:
+                    parts.append("".join(literal))
+                    literal = []
+                parts.append(lambda values, number: _mfNumber(number))
+            else:
+                literal.append(char)
+            position += 1
+        if literal:
+            parts.append("".join(literal))
+        return position, parts
+
+    def _mfParseArgument(pattern, position, plural, inPlural):
+        # position is right after '{', returns the position after the closing '}'
+        end = _mfFind(pattern, position, ",}")
+        name = pattern[position:end].strip()
+        if not name or re.search(r"[\s{}#']", name):
+            raise ValueError(f"invalid argument name '{name}' at {position}")
+        if pattern[end] == "}":
+            return end + 1, lambda values, number: _mfString(_mfValue(values, name))
+
+        position = end + 1
+        end = _mfFind(pattern, position, ",}")
+        argType = pattern[position:end].strip()
+
+        # simple arguments like {n, number} or {n, number, percent}
+        if argType not in ("select", "plural"):
+            style = None
+            if pattern[end] == ",":
+                close = _mfFind(pattern, end + 1, "{}")
+                if pattern[close] != "}":
+                    raise ValueError(f"unexpected '{{' at {close}")
+                style = pattern[end + 1 : close].strip()
+                end = close
+            if argType == "number":
+                return end + 1, lambda values, number: _mfNumber(
+                    _mfValue(values, name), style
+                )
+            return end + 1, lambda values, number: _mfString(_mfValue(values, name))
+
+        if pattern[end] != ",":
+            raise ValueError(f"missing {argType} options at {end}")
+        position = end + 1
+        offset = 0
+        options = {}
+        exact = {}
+        while True:
+            position = _mfSkipSpace(pattern, position)
+            if position >= len(pattern):
+                raise ValueError(f"unterminated {argType} argument '{name}'")
+            if pattern[position] == "}":
+                break
+            keyEnd = position
+            while keyEnd < len(pattern) and pattern[keyEnd] not in "{} \t\r\n":
+                keyEnd += 1
+            key = pattern[position:keyEnd]
+            position = _mfSkipSpace(pattern, keyEnd)
+            if argType == "plural" and key.startswith("offset:"):
+                value = key[len("offset:") :]
+                if not value:
+                    valueEnd = position
+                    while valueEnd < len(pattern) and pattern[valueEnd].isdigit():
+                        valueEnd += 1
+                    value = pattern[position:valueEnd]
+                    position = valueEnd
+                if not value.isdigit():
+                    raise ValueError(f"invalid offset '{value}' in argument '{name}'")
+                offset = int(value)
+                continue
+            if not key or position >= len(pattern) or pattern[position] != "{":
+                raise ValueError(f"expected '{{' after '{key}' at {position}")
+            position, parts = _mfParseMessage(
+                pattern, position + 1, plural, inPlural or argType == "plural"
+            )
+            if position >= len(pattern):
+                raise ValueError(f"unterminated option '{key}' in argument '{name}'")
+            position += 1
+            if argType == "plural" and key.startswith("="):
+                exact[_toNumber(key[1:])] = _mfJoin(parts)
+            else:
+                options[key] = _mfJoin(parts)
+        if "other" not in options:
+            raise ValueError(f"missing 'other' option in argument '{name}'")
+        other = options["other"]
+
+        if argType == "select":
+
+            def select(values, number):
+                value = _mfValue(values, name)
+                key = str(value).lower() if type(value) is bool else str(value)
+                return options.get(key, other)(values, number)
+
+            return position + 1, select
+
+        def pluralize(values, number):
+            count = _toNumber(_mfValue(values, name))
+            if count is None:
+                return other(values, number)
+            if count in exact:
+                return exact[count](values, count - offset)
+            return options.get(plural(count - offset), other)(values, count - offset)
+
+        return position + 1, pluralize
+
+    def _mfFind(pattern, position, chars):
+        while position < len(pattern):
+            if pattern[position] in chars:
+                return position
+            position += 1
+        raise ValueError("unterminated argument")
+
+    def _mfSkipSpace(pattern, position):
+        while position < len(pattern) and pattern[position].isspace():
+            position += 1
+        return position
+
+    def _mfValue(values, name):
+        if type(values) is dict:
+            return values.get(name)
+        if type(values) is list and name.isdigit() and int(name) < len(values):
+            return values[int(name)]
+        return None
+
+    def _mfString(value):
+        return "" if value is None else str(value)
+
+    def _mfNumber(value, style=None):
+        number = _toNumber(value) if type(value) is str else value
+        if type(number) is not int and type(number) is not float:
+            return _mfString(value)
+        if style == "percent":
+            return f"{round(number * 100)}%"
+        if style == "integer" or (type(number) is float and number.is_integer()):
+            return str(int(round(number)))
+        return str(number)
+
     def _rename(source, target):
         while True:
             try:
@@ -1227,12 +4573,20 @@ def I18n(_OPTS: _OptionType = False):
 
     class I18n(object):
         def __init__(self):
+            nonlocal owner
             self.__dict__ = i18n
+            owner = weakref.ref(self)
+            bindOwner()
+            _instances.add(self)
 
         def __del__(self):
             # tricks
-            nonlocal directory
-            _WatchDogFactory.delete(os.path.abspath(directory))
+            # at shutdown the atexit hooks have flushed already, a frozen daemon thread may hold our locks
+            if sys.is_finalizing():
+                return
+            stopFlusher()
+            releaseCatalogs()
+            unwatchFiles()
 
         version: str
 
@@ -1246,6 +4600,14 @@ def I18n(_OPTS: _OptionType = False):
         ) -> None:
             ...
 
+        @staticmethod
+        def wsgiMiddleware(application: Callable[..., Any]) -> Callable[..., Any]:
+            ...
+
+        @staticmethod
+        def asgiMiddleware(application: Callable[..., Any]) -> Callable[..., Any]:
+            ...
+
         @overload
         @staticmethod
         def __(phraseOrOptions: dict[str, str] | str, *replace: str | None) -> str:
@@ -1336,4 +4698,34 @@ def I18n(_OPTS: _OptionType = False):
         def removeLocale(locale: str) -> None:
             ...
 
+        @staticmethod
+        def flush() -> None:
+            ...
+
+        @staticmethod
+        def getLoadTimings() -> dict[str, float]:
+            ...
+
+        @staticmethod
+        def beforeFork() -> None:
+            ...
+
+        @staticmethod
+        def afterFork() -> None:
+            ...
+
+        @staticmethod
+        def releaseSharedCatalogs() -> None:
+            ...
+
+        @staticmethod
+        def subscribe(
+            callback: Callable[[str, dict[str, list[str]]], None]
+        ) -> Callable[[], None]:
+            ...
+
+        @staticmethod
+        def getNamespace(namespace: str) -> Any:
+            ...
+
     return I18n()
@@ -0,0 +1,83 @@
+import shutil
+import tempfile
+import unittest
+
+from simple_i18n.I18n import I18n
+
+
+class AcceptLanguageTest(unittest.TestCase):
+    def setUp(self):
+        self.i18n = self.create()
+
+    def create(self, **options):
+        return I18n(
+            {
+                "staticCatalog": {
+                    "en": {"Hello": "Hello"},
+                    "de": {"Hello": "Hallo"},
+                    "fr": {"Hello": "Bonjour"},
+                    "pt": {"Hello": "Olá"},
+                },
+                "defaultLocale": "en",
+                "queryParameter": "lang",
+                **options,
+            }
+        )
+
+    def guess(self, header, i18n=None, **request):
+        request = {"headers": {"accept-language": header}, **request}
+        (i18n or self.i18n).init(request)
+        return request
+
+    def test_quality_sorting(self):
+        self.assertEqual(self.guess("fr;q=0.5,de;q=0.9,en;q=0.1")["locale"], "de")
+        self.assertEqual(self.guess("fr;q=0.5, de")["locale"], "de")
+        self.assertEqual(self.guess("de;q=0,fr")["locale"], "fr")
+        self.assertEqual(self.guess("xx,yy;q=0.5")["locale"], "en")
+
+    def test_languages_and_regions(self):
+        request = self.guess("xx-YY,pt-BR;q=0.8,de;q=0.5")
+        self.assertEqual(request["locale"], "de")
+        self.assertEqual(request["language"], "de")
+        self.assertEqual(request["languages"], ["xx", "pt", "de"])
+        self.assertEqual(request["regions"], ["YY", "BR"])
+        self.assertEqual(request["region"], "YY")
+
+    def test_parent_language(self):
+        self.assertEqual(self.guess("pt-BR")["locale"], "pt")
+        # an exact match later in the header beats the parent language
+        self.assertEqual(self.guess("pt-BR,fr;q=0.5")["locale"], "fr")
+
+    def test_fallback_priority(self):
+        i18n = self.create(fallbacks={"de-*": "de", "nl": "de"})
+        self.assertEqual(self.guess("de-AT,fr;q=0.5", i18n)["locale"], "de")
+        self.assertEqual(self.guess("nl,fr;q=0.5", i18n)["locale"], "de")
+        # a language of higher quality is preferred over a fallback
+        self.assertEqual(self.guess("fr,nl;q=0.5", i18n)["locale"], "fr")
+
+    def test_query_parameter(self):
+        request = self.guess("de", url="/path?lang=fr")
+        self.assertEqual(request["locale"], "fr")
+        self.assertEqual(request["language"], "fr")
+
+    def test_header_cache(self):
+        first = self.guess("de-CH,fr;q=0.5")
+        first["languages"].append("xx")
+        first["regions"].clear()
+        second = self.guess("de-CH,fr;q=0.5")
+        self.assertEqual(second["locale"], "fr")
+        self.assertEqual(second["languages"], ["de", "fr"])
+        self.assertEqual(second["regions"], ["CH"])
+
+    def test_header_cache_invalidation(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        i18n = I18n({"locales": ["en"], "directory": directory, "defaultLocale": "en"})
+        self.assertEqual(self.guess("es", i18n)["locale"], "en")
+        # a new locale is created on its first miss
+        getattr(i18n, "__")({"phrase": "Hello", "locale": "es"})
+        self.assertEqual(self.guess("es", i18n)["locale"], "es")
+
+
+if __name__ == "__main__":
+    unittest.main()
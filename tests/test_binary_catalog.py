@@ -0,0 +1,101 @@
+import json
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+from simple_i18n.I18n import I18n
+
+
+class BinaryCatalogTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.file = os.path.join(self.directory, "en.json")
+        self.binary = f"{self.file}.bin"
+        self.catalog = {
+            "Hello": "Hi",
+            "Grüße": "Grüße 🌍",
+            "%s cat": {"one": "%s cat", "other": "%s cats"},
+            "nested": {"deep": {"value": 1}},
+            **{f"key {n}": f"value {n}" for n in range(500)},
+        }
+        self.writeCatalog(self.catalog)
+        self.debug = []
+
+    def writeCatalog(self, catalog):
+        with open(self.file, "w", encoding="utf-8") as file:
+            json.dump(catalog, file, ensure_ascii=False)
+
+    def create(self, **options):
+        return I18n(
+            {
+                "locales": ["en"],
+                "directory": self.directory,
+                "defaultLocale": "en",
+                "binaryCatalog": True,
+                "logDebugFn": lambda message: self.debug.append(message),
+                **options,
+            }
+        )
+
+    def assertTranslations(self, i18n, catalog):
+        translate = getattr(i18n, "__")
+        plural = getattr(i18n, "__n")
+        for key, value in catalog.items():
+            if type(value) is str:
+                self.assertEqual(translate(key), value, key)
+        self.assertEqual(plural("%s cat", 1), "1 cat")
+        self.assertEqual(plural("%s cat", 3), "3 cats")
+
+    def test_compiled_on_first_read(self):
+        self.assertFalse(os.path.exists(self.binary))
+        self.assertTranslations(self.create(), self.catalog)
+        self.assertTrue(os.path.exists(self.binary))
+
+    def test_round_trip(self):
+        self.create()
+        self.debug.clear()
+        i18n = self.create(updateFiles=False)
+        self.assertFalse([line for line in self.debug if ".bin" in line], self.debug)
+        self.assertTranslations(i18n, self.catalog)
+        self.assertEqual(getattr(i18n, "__")("missing"), "missing")
+
+    def test_added_keys_written_with_the_file(self):
+        self.create()
+        translate = getattr(self.create(), "__")
+        self.assertEqual(translate("New key"), "New key")
+        with open(self.file, encoding="utf-8") as file:
+            written = json.load(file)
+        self.assertEqual(written, {**self.catalog, "New key": "New key"})
+
+    def test_stale_binary_is_rebuilt(self):
+        self.create()
+        source = os.stat(self.binary).st_mtime_ns
+        changed = {**self.catalog, "Hello": "Hey there"}
+        time.sleep(0.01)
+        self.writeCatalog(changed)
+        self.debug.clear()
+
+        i18n = self.create(updateFiles=False)
+        self.assertTrue([line for line in self.debug if "out of date" in line], self.debug)
+        self.assertTranslations(i18n, changed)
+        self.assertNotEqual(os.stat(self.binary).st_mtime_ns, source)
+
+        self.debug.clear()
+        self.assertTranslations(self.create(updateFiles=False), changed)
+        self.assertFalse([line for line in self.debug if ".bin" in line], self.debug)
+
+    def test_corrupt_binary_falls_back_to_the_file(self):
+        self.create()
+        with open(self.binary, "wb") as file:
+            file.write(b"not a catalog at all")
+        self.debug.clear()
+        i18n = self.create(updateFiles=False)
+        self.assertTrue([line for line in self.debug if "not using" in line], self.debug)
+        self.assertTranslations(i18n, self.catalog)
+
+
+if __name__ == "__main__":
+    unittest.main()
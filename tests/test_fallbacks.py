@@ -0,0 +1,88 @@
+import re
+import unittest
+
+from simple_i18n.I18n import I18n
+
+LOCALES = ["en", "de", "fr", "pt"]
+
+TAGS = ["de-AT", "de-CH", "de-CH-1996", "deAT", "d", "fr-CA", "it-CH", "nl", "nl-BE", "zz", ""]
+
+FALLBACKS = [
+    {"de-AT": "fr", "de-*": "de"},
+    {"de-*": "de", "de-AT": "fr"},
+    {"*": "pt", "de-*": "de"},
+    {"de-*": "de", "*": "pt"},
+    {"d*": "fr", "de-*": "de"},
+    {"de-*": "de", "d*": "fr"},
+    {"de-CH*": "pt", "de-*": "de"},
+    {"de-*": "de", "de-CH*": "pt"},
+    {"*-CH": "fr", "de-*": "de"},
+    {"de-*": "de", "*-CH": "fr"},
+    {"de.*": "pt", "nl": "de", "nl-*": "fr"},
+    {"*-*": "fr", "nl*": "de"},
+]
+
+
+def linearFallback(tag, fallbacks):
+    # the plain scan over the configured keys this replaced
+    if tag in fallbacks:
+        return fallbacks[tag]
+    for key in fallbacks:
+        if re.search(r"^" + key.replace("*", ".*") + r"$", str(tag)):
+            return fallbacks[key]
+    return None
+
+
+class FallbacksTest(unittest.TestCase):
+    def create(self, fallbacks):
+        return I18n(
+            {
+                "staticCatalog": {locale: {"Hello": f"Hello {locale}"} for locale in LOCALES},
+                "defaultLocale": "en",
+                "fallbacks": fallbacks,
+                "logWarnFn": lambda *args: None,
+            }
+        )
+
+    def test_same_as_linear_scan(self):
+        for fallbacks in FALLBACKS:
+            i18n = self.create(fallbacks)
+            for tag in TAGS:
+                expected = linearFallback(tag, fallbacks) or "en"
+                self.assertEqual(i18n.setLocale(tag), expected, (fallbacks, tag))
+
+    def test_exact_before_wildcard(self):
+        for fallbacks in FALLBACKS[:2]:
+            i18n = self.create(fallbacks)
+            self.assertEqual(i18n.setLocale("de-AT"), "fr")
+            self.assertEqual(i18n.setLocale("de-CH"), "de")
+
+    def test_configuration_order_between_wildcards(self):
+        self.assertEqual(self.create({"d*": "fr", "de-*": "de"}).setLocale("de-AT"), "fr")
+        self.assertEqual(self.create({"de-*": "de", "d*": "fr"}).setLocale("de-AT"), "de")
+        self.assertEqual(self.create({"*-CH": "fr", "de-*": "de"}).setLocale("de-CH"), "fr")
+        self.assertEqual(self.create({"de-*": "de", "*-CH": "fr"}).setLocale("de-CH"), "de")
+
+    def test_known_locale_needs_no_fallback(self):
+        self.assertEqual(self.create({"*": "pt"}).setLocale("de"), "de")
+
+    def test_memoized_resolution(self):
+        i18n = self.create({"de-*": "de"})
+        translate = getattr(i18n, "__")
+        for _ in range(3):
+            self.assertEqual(translate({"phrase": "Hello", "locale": "de-AT"}), "Hello de")
+            self.assertEqual(translate({"phrase": "Hello", "locale": "zz"}), "Hello en")
+
+        # a new configuration forgets what was resolved before
+        i18n.configure(
+            {
+                "staticCatalog": {locale: {"Hello": f"Hello {locale}"} for locale in LOCALES},
+                "defaultLocale": "en",
+                "fallbacks": {"de-*": "fr"},
+            }
+        )
+        self.assertEqual(translate({"phrase": "Hello", "locale": "de-AT"}), "Hello fr")
+
+
+if __name__ == "__main__":
+    unittest.main()
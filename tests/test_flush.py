@@ -0,0 +1,126 @@
+import gc
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import unittest
+import weakref
+from unittest import mock
+
+from simple_i18n.I18n import I18n
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class FlushTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.addCleanup(self.waitForFlushers)
+        for locale in ["en", "de"]:
+            with open(self.file(locale), "w", encoding="utf-8") as file:
+                json.dump({"Hello": "Hello"}, file)
+
+    def file(self, locale):
+        return os.path.join(self.directory, f"{locale}.json")
+
+    def read(self, locale):
+        with open(self.file(locale), encoding="utf-8") as file:
+            return json.load(file)
+
+    def options(self, **options):
+        return {
+            "locales": ["en", "de"],
+            "directory": self.directory,
+            "defaultLocale": "en",
+            **options,
+        }
+
+    def flushers(self):
+        return [
+            thread for thread in threading.enumerate() if thread.name == "i18n-flusher"
+        ]
+
+    def waitForFlushers(self):
+        # instances of a test are gone once collected, their flushers end shortly after
+        deadline = time.monotonic() + 5
+        while self.flushers() and time.monotonic() < deadline:
+            gc.collect()
+            time.sleep(0.02)
+
+    def test_one_write_per_locale_and_interval(self):
+        i18n = I18n(self.options(flushInterval=0.2))
+        translate = getattr(i18n, "__")
+        with mock.patch("shutil.move", wraps=shutil.move) as move:
+            for n in range(50):
+                translate(f"Key {n}")
+                translate({"phrase": f"Key {n}", "locale": "de"})
+            self.assertEqual(move.call_count, 0)
+            self.assertNotIn("Key 0", self.read("en"))
+            i18n.flush()
+            targets = sorted(os.path.basename(call.args[1]) for call in move.call_args_list)
+        self.assertEqual(targets, ["de.json", "en.json"])
+        self.assertEqual(len(self.read("en")), 51)
+        self.assertEqual(len(self.read("de")), 51)
+
+    def test_flusher_writes_after_interval(self):
+        translate = getattr(I18n(self.options(flushInterval=0.05)), "__")
+        translate("Later")
+        deadline = time.monotonic() + 5
+        while "Later" not in self.read("en") and time.monotonic() < deadline:
+            time.sleep(0.02)
+        self.assertIn("Later", self.read("en"))
+
+    def test_flush_on_reconfigure(self):
+        i18n = I18n(self.options(flushInterval=60))
+        getattr(i18n, "__")("Pending")
+        i18n.configure(self.options(flushInterval=60))
+        self.assertIn("Pending", self.read("en"))
+
+    def test_dropped_instance_is_torn_down(self):
+        # neither the flusher nor the file watcher keep it alive
+        i18n = I18n(self.options(flushInterval=60, autoReload=True))
+        getattr(i18n, "__")("Dropped")
+        reference = weakref.ref(i18n)
+        del i18n
+        gc.collect()
+        self.assertIsNone(reference())
+        self.assertIn("Dropped", self.read("en"))
+        self.waitForFlushers()
+        self.assertEqual(self.flushers(), [])
+
+    def test_reachable_translator_is_kept(self):
+        translate = I18n(self.options(flushInterval=60)).__
+        gc.collect()
+        translate("Kept")
+        gc.collect()
+        self.assertNotIn("Kept", self.read("en"))
+        self.assertEqual(len(self.flushers()), 1)
+
+    def test_pending_keys_written_at_exit(self):
+        script = (
+            "import sys\n"
+            "from simple_i18n.I18n import I18n\n"
+            "i18n = I18n({'locales': ['en'], 'directory': sys.argv[1], 'flushInterval': 60})\n"
+            "i18n.__('From instance')\n"
+            "translate = I18n({'locales': ['de'], 'directory': sys.argv[1],"
+            " 'defaultLocale': 'de', 'flushInterval': 60}).__\n"
+            "import gc; gc.collect()\n"
+            "translate('From translator')\n"
+        )
+        subprocess.run(
+            [sys.executable, "-W", "ignore", "-c", script, self.directory],
+            cwd=ROOT,
+            check=True,
+            timeout=60,
+        )
+        self.assertIn("From instance", self.read("en"))
+        self.assertIn("From translator", self.read("de"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,116 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from simple_i18n.I18n import I18n
+
+
+class JournalTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.file = os.path.join(self.directory, "en.json")
+        self.journal = f"{self.file}.journal"
+        with open(self.file, "w", encoding="utf-8") as file:
+            json.dump({"Hello": "Hi"}, file)
+        self.errors = []
+
+    def create(self, **options):
+        return I18n(
+            {
+                "locales": ["en"],
+                "directory": self.directory,
+                "defaultLocale": "en",
+                "journal": True,
+                "logErrorFn": lambda *args: self.errors.append(args),
+                **options,
+            }
+        )
+
+    def readFile(self):
+        with open(self.file, encoding="utf-8") as file:
+            return json.load(file)
+
+    def readJournal(self):
+        with open(self.journal, encoding="utf-8") as file:
+            return [json.loads(line) for line in file]
+
+    def test_append_leaves_base_file(self):
+        translate = getattr(self.create(), "__")
+        translate("One")
+        translate("Two")
+        self.assertEqual(self.readFile(), {"Hello": "Hi"})
+        self.assertEqual(self.readJournal(), [[["One"], "One"], [["Two"], "Two"]])
+
+    def read(self, key, **options):
+        # translate without writing misses back
+        return getattr(self.create(updateFiles=False, **options), "__")(key)
+
+    def test_replay_over_base_file(self):
+        translate = getattr(self.create(), "__")
+        translate("One")
+        with open(self.journal, "a", encoding="utf-8") as file:
+            file.write(json.dumps([["Hello"], "Hey"]) + "\n")
+            file.write(json.dumps([["Two"], "Zwei"]) + "\n")
+
+        self.assertEqual(self.read("Hello"), "Hey")
+        self.assertEqual(self.read("Two"), "Zwei")
+        self.assertEqual(self.readFile(), {"Hello": "Hi"})
+        self.assertEqual(self.errors, [])
+
+    def test_replay_object_notation(self):
+        translate = getattr(self.create(objectNotation=True), "__")
+        translate("greeting.formal")
+        self.assertEqual(self.readJournal(), [[["greeting", "formal"], "greeting.formal"]])
+
+        with open(self.journal, "a", encoding="utf-8") as file:
+            file.write(json.dumps([["greeting", "casual"], "Hey"]) + "\n")
+        self.assertEqual(self.read("greeting.casual", objectNotation=True), "Hey")
+        self.assertEqual(
+            self.read("greeting.formal", objectNotation=True), "greeting.formal"
+        )
+
+    def test_compaction(self):
+        translate = getattr(self.create(journalMaxSize=100), "__")
+        translate("One")
+        self.assertTrue(os.path.exists(self.journal))
+        for n in range(10):
+            translate(f"Key {n}")
+        # compacted at least once, whatever came after is journaled again
+        catalog = self.readFile()
+        self.assertEqual(catalog["Hello"], "Hi")
+        self.assertEqual(catalog["One"], "One")
+        self.assertIn("Key 0", catalog)
+        journaled = []
+        if os.path.exists(self.journal):
+            self.assertLessEqual(os.stat(self.journal).st_size, 100)
+            journaled = [path[0] for path, value in self.readJournal()]
+        for n in range(10):
+            self.assertTrue(f"Key {n}" in catalog or f"Key {n}" in journaled, n)
+
+    def test_oversized_journal_compacted_on_load(self):
+        with open(self.journal, "w", encoding="utf-8") as file:
+            for n in range(10):
+                file.write(json.dumps([[f"Key {n}"], f"Value {n}"]) + "\n")
+        translate = getattr(self.create(journalMaxSize=100), "__")
+        self.assertEqual(translate("Key 3"), "Value 3")
+        self.assertFalse(os.path.exists(self.journal))
+        self.assertEqual(self.readFile()["Key 9"], "Value 9")
+
+    def test_truncated_last_line(self):
+        with open(self.journal, "w", encoding="utf-8") as file:
+            file.write(json.dumps([["One"], "Eins"]) + "\n")
+            file.write(json.dumps([["Two"], "Zwei"]) + "\n")
+            file.write('[["Three"], "Dr')
+
+        translate = getattr(self.create(updateFiles=False), "__")
+        self.assertEqual(translate("One"), "Eins")
+        self.assertEqual(translate("Two"), "Zwei")
+        self.assertEqual(translate("Three"), "Three")
+        self.assertEqual(len(self.errors), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
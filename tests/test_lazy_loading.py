@@ -0,0 +1,99 @@
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+
+from simple_i18n.I18n import I18n
+
+LOCALES = ["en", "de", "fr"]
+
+
+class CountingParser:
+    # json, slow enough for concurrent first accesses to overlap
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reads = []
+
+    def loads(self, content):
+        catalog = json.loads(content)
+        with self.lock:
+            self.reads.append(catalog["Hello"])
+        time.sleep(0.05)
+        return catalog
+
+    def dumps(self, catalog, **kwargs):
+        return json.dumps(catalog, **kwargs)
+
+
+class LazyLoadingTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        for locale in LOCALES:
+            with open(os.path.join(self.directory, f"{locale}.json"), "w") as file:
+                json.dump({"Hello": f"Hello {locale}"}, file)
+        self.parser = CountingParser()
+        self.debug = []
+
+    def create(self, **options):
+        return I18n(
+            {
+                "locales": LOCALES,
+                "directory": self.directory,
+                "defaultLocale": "en",
+                "lazyLoading": True,
+                "parser": self.parser,
+                "updateFiles": False,
+                "logDebugFn": lambda message: self.debug.append(message),
+                **options,
+            }
+        )
+
+    def test_nothing_read_until_accessed(self):
+        i18n = self.create()
+        self.assertEqual(self.parser.reads, [])
+        translate = getattr(i18n, "__")
+        self.assertEqual(translate({"phrase": "Hello", "locale": "de"}), "Hello de")
+        self.assertEqual(self.parser.reads, ["Hello de"])
+        self.assertEqual(translate({"phrase": "Hello", "locale": "de"}), "Hello de")
+        self.assertEqual(self.parser.reads, ["Hello de"])
+
+    def test_preload(self):
+        i18n = self.create(preload=["en", "fr"])
+        self.assertEqual(sorted(self.parser.reads), ["Hello en", "Hello fr"])
+        self.assertEqual(getattr(i18n, "__")("Hello"), "Hello en")
+        self.assertEqual(len(self.parser.reads), 2)
+
+    def test_single_load_under_concurrency(self):
+        translate = getattr(self.create(), "__")
+        barrier = threading.Barrier(16)
+        results = []
+
+        def access():
+            barrier.wait()
+            results.append(translate({"phrase": "Hello", "locale": "fr"}))
+
+        threads = [threading.Thread(target=access) for _ in range(16)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(10)
+
+        self.assertEqual(results, ["Hello fr"] * 16)
+        self.assertEqual(self.parser.reads, ["Hello fr"])
+        loaded = [line for line in self.debug if "on first access" in line]
+        self.assertEqual(loaded, ["loading locale fr on first access"])
+
+    def test_unknown_locale_is_not_read(self):
+        i18n = self.create()
+        self.assertEqual(i18n.setLocale("fr"), "fr")
+        self.assertEqual(i18n.setLocale("xx"), "en")
+        self.assertNotIn("Hello xx", self.parser.reads)
+        self.assertFalse(os.path.exists(os.path.join(self.directory, "xx.json")))
+
+
+if __name__ == "__main__":
+    unittest.main()
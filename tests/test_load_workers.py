@@ -0,0 +1,117 @@
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+
+from simple_i18n.I18n import I18n
+
+LOCALES = ["en", "de", "fr", "it", "nl", "pt"]
+
+
+class OverlapParser:
+    # json, recording how many catalogs were parsed at the same time
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.running = 0
+        self.overlap = 0
+        self.reads = 0
+
+    def loads(self, content):
+        with self.lock:
+            self.running += 1
+            self.reads += 1
+            self.overlap = max(self.overlap, self.running)
+        time.sleep(0.05)
+        with self.lock:
+            self.running -= 1
+        return json.loads(content)
+
+    def dumps(self, catalog, **kwargs):
+        return json.dumps(catalog, **kwargs)
+
+
+class LoadWorkersTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        for locale in LOCALES:
+            with open(os.path.join(self.directory, f"{locale}.json"), "w") as file:
+                json.dump({"Hello": f"Hello {locale}"}, file)
+        self.warnings = []
+
+    def create(self, **options):
+        return I18n(
+            {
+                "locales": LOCALES,
+                "directory": self.directory,
+                "defaultLocale": "en",
+                "updateFiles": False,
+                "logWarnFn": lambda message: self.warnings.append(message),
+                **options,
+            }
+        )
+
+    def assertAllLoaded(self, i18n):
+        translate = getattr(i18n, "__")
+        for locale in LOCALES:
+            self.assertEqual(
+                translate({"phrase": "Hello", "locale": locale}), f"Hello {locale}"
+            )
+
+    def test_sequential_by_default(self):
+        parser = OverlapParser()
+        i18n = self.create(parser=parser)
+        self.assertAllLoaded(i18n)
+        self.assertEqual(parser.reads, len(LOCALES))
+        self.assertEqual(parser.overlap, 1)
+
+    def test_threads_read_concurrently(self):
+        parser = OverlapParser()
+        i18n = self.create(parser=parser, loadWorkers=len(LOCALES))
+        self.assertAllLoaded(i18n)
+        self.assertEqual(parser.reads, len(LOCALES))
+        self.assertGreater(parser.overlap, 1)
+        timings = i18n.getLoadTimings()
+        self.assertEqual(sorted(timings), sorted(LOCALES))
+        self.assertTrue(all(seconds >= 0.05 for seconds in timings.values()), timings)
+
+    def test_processes_parse_with_a_module(self):
+        i18n = self.create(parser=json, loadWorkers=2, loadExecutor="process")
+        self.assertAllLoaded(i18n)
+        self.assertEqual(self.warnings, [])
+
+    def test_processes_need_a_module(self):
+        parser = OverlapParser()
+        i18n = self.create(parser=parser, loadWorkers=2, loadExecutor="process")
+        self.assertAllLoaded(i18n)
+        self.assertEqual(len(self.warnings), 1)
+        self.assertEqual(parser.reads, len(LOCALES))
+
+    def test_unreadable_locale_is_initialized(self):
+        with open(os.path.join(self.directory, "nl.json"), "w") as file:
+            file.write("{ not json")
+        sequentialErrors = []
+        concurrentErrors = []
+        sequential = getattr(
+            self.create(logErrorFn=lambda *args: sequentialErrors.append(args)), "__"
+        )
+        concurrent = getattr(
+            self.create(
+                loadWorkers=3, logErrorFn=lambda *args: concurrentErrors.append(args)
+            ),
+            "__",
+        )
+        # the same as a sequential read, the other locales are unaffected
+        for locale in LOCALES:
+            phrase = {"phrase": "Hello", "locale": locale}
+            self.assertEqual(concurrent(phrase), sequential(phrase), locale)
+        self.assertEqual(concurrent({"phrase": "Hello", "locale": "pt"}), "Hello pt")
+        self.assertTrue(concurrentErrors)
+        self.assertEqual(len(concurrentErrors), len(sequentialErrors))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+import unittest
+
+from simple_i18n.I18n import I18n
+
+
+class MessageformatTest(unittest.TestCase):
+    def setUp(self):
+        self.errors = []
+        self.i18n = I18n(
+            {
+                "staticCatalog": {
+                    "en": {
+                        "greeting": "Hello {name}",
+                        "things": "{N, plural, one {# thing} other {# things}}",
+                    },
+                    "de": {"greeting": "Hallo {name}"},
+                },
+                "defaultLocale": "en",
+                "logErrorFn": lambda *args: self.errors.append(args),
+            }
+        )
+        # the api names would be mangled inside the class body
+        self.format = getattr(self.i18n, "__mf")
+
+    def mf(self, pattern, values=None):
+        return self.format(pattern, values or {})
+
+    def test_simple_argument(self):
+        self.assertEqual(self.format("greeting", {"name": "Ann"}), "Hello Ann")
+        self.assertEqual(self.mf("{a} and {b}", {"a": 1, "b": "two"}), "1 and two")
+        self.assertEqual(self.mf("missing {a}"), "missing ")
+
+    def test_locale(self):
+        self.assertEqual(
+            self.format({"phrase": "greeting", "locale": "de"}, {"name": "Ann"}),
+            "Hallo Ann",
+        )
+
+    def test_plural_with_hash(self):
+        self.assertEqual(self.format("things", {"N": 1}), "1 thing")
+        self.assertEqual(self.format("things", {"N": 5}), "5 things")
+        self.assertEqual(self.format("things", {"N": "2"}), "2 things")
+
+    def test_plural_exact_and_offset(self):
+        pattern = (
+            "{N, plural, offset:1 =0 {nobody} =1 {{who}} "
+            "one {{who} and # other} other {{who} and # others}}"
+        )
+        self.assertEqual(self.mf(pattern, {"N": 0, "who": "Ann"}), "nobody")
+        self.assertEqual(self.mf(pattern, {"N": 1, "who": "Ann"}), "Ann")
+        self.assertEqual(self.mf(pattern, {"N": 2, "who": "Ann"}), "Ann and 1 other")
+        self.assertEqual(self.mf(pattern, {"N": 4, "who": "Ann"}), "Ann and 3 others")
+
+    def test_nested_select_and_plural(self):
+        pattern = (
+            "{G, select, female {{N, plural, one {she has # cat} other {she has # cats}}} "
+            "other {{N, plural, one {they have # cat} other {they have # cats}}}}"
+        )
+        self.assertEqual(self.mf(pattern, {"G": "female", "N": 1}), "she has 1 cat")
+        self.assertEqual(self.mf(pattern, {"G": "male", "N": 3}), "they have 3 cats")
+        self.assertEqual(
+            self.mf("{B, select, true {yes} other {no}}", {"B": True}), "yes"
+        )
+
+    def test_hash_outside_plural(self):
+        self.assertEqual(self.mf("# {N}", {"N": 2}), "# 2")
+
+    def test_number_styles(self):
+        self.assertEqual(self.mf("{P, number, percent}", {"P": 0.25}), "25%")
+        self.assertEqual(self.mf("{P, number, integer}", {"P": 2.6}), "3")
+        self.assertEqual(self.mf("{P, number}", {"P": 2.0}), "2")
+
+    def test_escapes(self):
+        self.assertEqual(self.mf("it''s {name}", {"name": "me"}), "it's me")
+        self.assertEqual(self.mf("'{name}' is {name}", {"name": "x"}), "{name} is x")
+        self.assertEqual(self.mf("don't"), "don't")
+        self.assertEqual(
+            self.mf("{N, plural, other {'#' is #}}", {"N": 3}), "# is 3"
+        )
+        self.assertEqual(self.mf("'{it''s}'"), "{it's}")
+
+    def test_malformed_patterns(self):
+        for pattern in [
+            "{unterminated",
+            "{N, plural, one {x}}",
+            "{N, plural, other {x}",
+            "{N, select}",
+            "{N, plural, offset:x other {x}}",
+            "{N, plural, one x other {x}}",
+            "{bad name}",
+            "text }",
+        ]:
+            self.errors.clear()
+            self.assertEqual(self.mf(pattern, {"N": 1}), pattern, pattern)
+            self.assertEqual(len(self.errors), 1, pattern)
+
+    def test_formatted_output_per_call(self):
+        for n in range(20):
+            self.assertEqual(self.format("things", {"N": n}).split()[0], str(n))
+        self.assertEqual(self.format("{N} %s", "x", {"N": 1}), "1 x")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+import unittest
+
+import pystache
+
+from simple_i18n.I18n import I18n
+
+
+class MustacheTest(unittest.TestCase):
+    def setUp(self):
+        self.i18n = I18n({"staticCatalog": {"en": {}}, "defaultLocale": "en"})
+        # the api names would be mangled inside the class body
+        self.translate = getattr(self.i18n, "__")
+        self.pystache = pystache.Renderer(partials={})
+
+    def assertSameAsPystache(self, template, values):
+        self.assertEqual(
+            self.translate(template, values),
+            self.pystache.render(template, values),
+            (template, values),
+        )
+
+    def test_variables(self):
+        for template in ["{{a}}", "{{{a}}}", "{{&a}}", "x {{ a }} y", "{{a}}{{a}}"]:
+            for value in ["plain", "<b>\"&'</b>", "", 0, 1.5, -2]:
+                self.assertSameAsPystache(template, {"a": value})
+
+    def test_missing_values(self):
+        self.assertSameAsPystache("{{a}}!", {})
+        self.assertSameAsPystache("{{a.b}}!", {"a": {}})
+        self.assertSameAsPystache("{{a.b}}!", {})
+
+    def test_none_and_bool_values(self):
+        for value in [None, True, False]:
+            self.assertSameAsPystache("[{{a}}]", {"a": value})
+            self.assertSameAsPystache("[{{{a}}}]", {"a": value})
+            self.assertSameAsPystache("[{{a.b}}]", {"a": {"b": value}})
+
+    def test_list_and_dict_values(self):
+        self.assertSameAsPystache("[{{a}}]", {"a": [1, "<2>"]})
+        self.assertSameAsPystache("[{{a}}]", {"a": {"b": 1}})
+        self.assertSameAsPystache("[{{a.b}}]", {"a": [1]})
+
+    def test_dotted_names(self):
+        self.assertSameAsPystache("{{a.b.c}}", {"a": {"b": {"c": "<deep>"}}})
+
+    def test_sections_fall_back_to_pystache(self):
+        self.assertSameAsPystache("{{#a}}[{{.}}]{{/a}}", {"a": [1, 2]})
+        self.assertSameAsPystache("{{#a}}{{b}}{{/a}}", {"a": {"b": "<i>"}})
+        self.assertSameAsPystache("{{^a}}none{{/a}}", {"a": []})
+        self.assertSameAsPystache("a{{! note }}b", {})
+        self.assertSameAsPystache("{{=<% %>=}}<% a %>", {"a": "x"})
+
+    def test_partials_fall_back_to_pystache(self):
+        self.assertSameAsPystache("[{{>part}}]", {})
+        self.assertSameAsPystache("{{a}} [{{> part }}]", {"a": 1})
+
+    def test_unclosed_tags(self):
+        self.assertEqual(self.translate("{{a}", {"a": 1}), "{{a}")
+        self.assertEqual(self.translate("{{a", {"a": 1}), "{{a")
+
+    def test_custom_tags(self):
+        i18n = I18n(
+            {
+                "staticCatalog": {"en": {}},
+                "defaultLocale": "en",
+                "mustacheConfig": {"tags": ["<%", "%>"], "disable": False},
+            }
+        )
+        translate = getattr(i18n, "__")
+        self.assertEqual(translate("Hi <% name %>", {"name": "<Ann>"}), "Hi &lt;Ann&gt;")
+        self.assertEqual(translate("Hi {{name}}", {"name": "Ann"}), "Hi {{name}}")
+        self.assertEqual(
+            translate("<%#a%><%.%><%/a%>", {"a": [1, 2]}),
+            pystache.render("{{#a}}{{.}}{{/a}}", {"a": [1, 2]}),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
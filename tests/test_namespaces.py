@@ -0,0 +1,164 @@
+import gc
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+from simple_i18n.I18n import I18n
+
+
+class NamespacesTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.addCleanup(self.waitForFlushers)
+        with open(os.path.join(self.directory, "de.json"), "w", encoding="utf-8") as file:
+            json.dump({"Hello": "Hallo"}, file)
+        os.makedirs(os.path.join(self.directory, "de"))
+        self.writeShard("checkout", {"Pay now": "Jetzt zahlen"})
+        self.writeShard("admin", {"Users": "Benutzer", "Filler": "x" * 200})
+        self.debug = []
+
+    def shard(self, namespace):
+        return os.path.join(self.directory, "de", f"{namespace}.json")
+
+    def writeShard(self, namespace, catalog):
+        with open(self.shard(namespace), "w", encoding="utf-8") as file:
+            json.dump(catalog, file)
+
+    def readShard(self, namespace):
+        with open(self.shard(namespace), encoding="utf-8") as file:
+            return json.load(file)
+
+    def create(self, **options):
+        return I18n(
+            {
+                "locales": ["de"],
+                "directory": self.directory,
+                "defaultLocale": "de",
+                "namespaces": ["checkout", "admin"],
+                "logDebugFn": lambda message: self.debug.append(message),
+                **options,
+            }
+        )
+
+    def logged(self, text):
+        return [line for line in self.debug if text in line]
+
+    def waitForFlushers(self):
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline and any(
+            thread.name == "i18n-flusher" for thread in threading.enumerate()
+        ):
+            gc.collect()
+            time.sleep(0.02)
+
+    def test_read_on_first_use(self):
+        i18n = self.create()
+        translate = getattr(i18n, "__")
+        self.assertEqual(self.logged("read namespace"), [])
+        self.assertEqual(translate("checkout:Pay now"), "Jetzt zahlen")
+        self.assertEqual(translate("Hello"), "Hallo")
+        checkout = getattr(i18n.getNamespace("checkout"), "__")
+        self.assertEqual(checkout("Pay now"), "Jetzt zahlen")
+        self.assertEqual(len(self.logged("read namespace checkout of de")), 1)
+        self.assertEqual(self.logged("read namespace admin"), [])
+
+    def test_byte_budget_eviction(self):
+        budget = os.stat(self.shard("admin")).st_size + 10
+        translate = getattr(self.create(namespaceBudget=budget, updateFiles=False), "__")
+        translate("checkout:Pay now")
+        self.assertEqual(self.logged("evicted"), [])
+
+        # both don't fit, the least recently used one goes
+        self.assertEqual(translate("admin:Users"), "Benutzer")
+        self.assertEqual(self.logged("evicted"), ["evicted namespace checkout of de"])
+        self.assertEqual(translate("checkout:Pay now"), "Jetzt zahlen")
+        self.assertEqual(len(self.logged("read namespace checkout of de")), 2)
+        self.assertEqual(self.logged("evicted")[-1], "evicted namespace admin of de")
+
+    def test_most_recent_shard_stays_over_budget(self):
+        translate = getattr(self.create(namespaceBudget=1, updateFiles=False), "__")
+        for _ in range(3):
+            self.assertEqual(translate("admin:Users"), "Benutzer")
+        self.assertEqual(len(self.logged("read namespace admin of de")), 1)
+        self.assertEqual(self.logged("evicted"), [])
+
+    def test_evicted_pending_shard_served_from_memory(self):
+        i18n = self.create(namespaceBudget=1, flushInterval=60)
+        translate = getattr(i18n, "__")
+        self.assertEqual(translate("checkout:New key"), "New key")
+        translate("admin:Users")
+        self.assertEqual(self.logged("evicted"), ["evicted namespace checkout of de"])
+
+        # its unwritten change is neither lost nor read again from disk
+        self.assertNotIn("New key", self.readShard("checkout"))
+        self.assertEqual(translate("checkout:New key"), "New key")
+        self.assertEqual(len(self.logged("read namespace checkout of de")), 1)
+        i18n.flush()
+        self.assertEqual(self.readShard("checkout")["New key"], "New key")
+
+    def test_misses_written_by_the_flusher(self):
+        i18n = self.create(flushInterval=60)
+        translate = getattr(i18n, "__")
+        with mock.patch("shutil.move", wraps=shutil.move) as move:
+            for n in range(20):
+                translate(f"checkout:Key {n}")
+                translate(f"admin:Key {n}")
+            self.assertEqual(move.call_count, 0)
+            self.assertNotIn("Key 0", self.readShard("checkout"))
+            i18n.flush()
+            targets = sorted(os.path.basename(call.args[1]) for call in move.call_args_list)
+        self.assertEqual(targets, ["admin.json", "checkout.json"])
+        self.assertEqual(len(self.readShard("checkout")), 21)
+        self.assertEqual(len(self.readShard("admin")), 22)
+        # the keys went to the shards, not to the locale catalog
+        with open(os.path.join(self.directory, "de.json"), encoding="utf-8") as file:
+            self.assertEqual(json.load(file), {"Hello": "Hallo"})
+
+    def test_new_shard_is_created(self):
+        translate = getattr(self.create(namespaces=["help"]), "__")
+        self.assertEqual(translate("help:Contact"), "Contact")
+        self.assertEqual(self.readShard("help"), {"Contact": "Contact"})
+
+    def test_journal(self):
+        journal = f"{self.shard('checkout')}.journal"
+        translate = getattr(self.create(journal=True), "__")
+        translate("checkout:One")
+        translate("checkout:Two")
+        self.assertEqual(self.readShard("checkout"), {"Pay now": "Jetzt zahlen"})
+        with open(journal, encoding="utf-8") as file:
+            entries = [json.loads(line) for line in file]
+        self.assertEqual(entries, [[["One"], "One"], [["Two"], "Two"]])
+
+        # replayed by the next reader
+        with open(journal, "a", encoding="utf-8") as file:
+            file.write(json.dumps([["Pay now"], "Bezahlen"]) + "\n")
+        translate = getattr(self.create(updateFiles=False), "__")
+        self.assertEqual(translate("checkout:Pay now"), "Bezahlen")
+        self.assertEqual(translate("checkout:Two"), "Two")
+        self.assertEqual(translate("checkout:Three"), "Three")
+
+    def test_journal_compaction(self):
+        journal = f"{self.shard('checkout')}.journal"
+        translate = getattr(self.create(journal=True, journalMaxSize=100), "__")
+        for n in range(10):
+            translate(f"checkout:Key {n}")
+        self.assertTrue(self.logged("compacting"))
+        catalog = self.readShard("checkout")
+        journaled = []
+        if os.path.exists(journal):
+            self.assertLessEqual(os.stat(journal).st_size, 100)
+            with open(journal, encoding="utf-8") as file:
+                journaled = [json.loads(line)[0][0] for line in file]
+        self.assertEqual(catalog["Pay now"], "Jetzt zahlen")
+        for n in range(10):
+            self.assertTrue(f"Key {n}" in catalog or f"Key {n}" in journaled, n)
+
+
+if __name__ == "__main__":
+    unittest.main()
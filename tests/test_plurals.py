@@ -0,0 +1,135 @@
+import unittest
+
+from simple_i18n.I18n import I18n
+
+CATEGORIES = ["zero", "one", "two", "few", "many", "other"]
+
+
+class PluralsTest(unittest.TestCase):
+    def setUp(self):
+        entry = {category: category for category in CATEGORIES}
+        self.i18n = I18n(
+            {
+                "staticCatalog": {
+                    locale: {
+                        "cat": entry,
+                        "%s cat": {"one": "%s cat", "other": "%s cats"},
+                        "{{name}} has %s cat": {
+                            "one": "{{name}} has %s cat",
+                            "other": "{{name}} has %s cats",
+                        },
+                        "apples": "[0]no apples|[1]one apple|[2,5)few %s apples|[5,]%s apples",
+                        "open": "(0,2]some|(2,]lots",
+                    }
+                    for locale in ["en", "ru", "ar", "pl"]
+                },
+                "defaultLocale": "en",
+            }
+        )
+        # the api names would be mangled inside the class body
+        self.plural = getattr(self.i18n, "__n")
+
+    def category(self, locale, count):
+        return self.plural(
+            {"singular": "cat", "plural": "cat", "locale": locale}, count
+        )
+
+    def assertCategories(self, locale, expected):
+        for count, category in expected.items():
+            self.assertEqual(self.category(locale, count), category, (locale, count))
+
+    def test_english(self):
+        self.assertCategories(
+            "en", {0: "other", 1: "one", 2: "other", 21: "other", 1.5: "other"}
+        )
+
+    def test_russian(self):
+        self.assertCategories(
+            "ru",
+            {
+                1: "one",
+                21: "one",
+                2: "few",
+                24: "few",
+                5: "many",
+                11: "many",
+                12: "many",
+                111: "many",
+                1.5: "other",
+            },
+        )
+
+    def test_arabic(self):
+        self.assertCategories(
+            "ar",
+            {
+                0: "zero",
+                1: "one",
+                2: "two",
+                3: "few",
+                110: "few",
+                11: "many",
+                99: "many",
+                100: "other",
+                102: "other",
+            },
+        )
+
+    def test_polish(self):
+        self.assertCategories(
+            "pl",
+            {
+                1: "one",
+                2: "few",
+                22: "few",
+                0: "many",
+                5: "many",
+                12: "many",
+                112: "many",
+                1.5: "other",
+            },
+        )
+
+    def test_region_and_unknown_locales(self):
+        self.assertEqual(self.category("en-GB", 1), "one")
+        self.assertEqual(self.category("ru_RU", 3), "few")
+        self.assertEqual(self.category("xx", 1), "other")
+
+    def test_float_operand(self):
+        self.assertEqual(self.plural("cat", 1.0), "one")
+        self.assertEqual(self.plural("cat", 1.5), "other")
+        self.assertEqual(self.category("ru", 2.0), "few")
+        self.assertEqual(self.category("ar", 3.0), "few")
+        self.assertEqual(self.plural("cat", "1"), "one")
+        self.assertEqual(self.plural("cat", "2.5"), "other")
+
+    def test_counter(self):
+        for count in range(50):
+            expected = "1 cat" if count == 1 else f"{count} cats"
+            self.assertEqual(self.plural("%s cat", count), expected)
+        self.assertEqual(
+            self.plural("{{name}} has %s cat", 3, {"name": "<Ann>"}),
+            "&lt;Ann&gt; has 3 cats",
+        )
+        self.assertEqual(
+            self.plural("{{name}} has %s cat", 1, {"name": "Ann"}), "Ann has 1 cat"
+        )
+
+    def test_intervals(self):
+        self.assertEqual(self.plural("apples", 0), "no apples")
+        self.assertEqual(self.plural("apples", 1), "one apple")
+        self.assertEqual(self.plural("apples", 2), "few 2 apples")
+        self.assertEqual(self.plural("apples", 4), "few 4 apples")
+        self.assertEqual(self.plural("apples", 5), "5 apples")
+        self.assertEqual(self.plural("apples", 10**6), "1000000 apples")
+        self.assertEqual(self.plural("open", 1), "some")
+        self.assertEqual(self.plural("open", 2), "some")
+        self.assertEqual(self.plural("open", 3), "lots")
+
+    def test_interval_without_match(self):
+        # no interval matches, the phrase is used as a whole
+        self.assertEqual(self.plural("open", 0), "(0,2]some|(2,]lots")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,145 @@
+import gc
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+import uuid
+
+from simple_i18n.I18n import I18n
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SHM = "/dev/shm"
+
+
+@unittest.skipUnless(os.path.isdir(SHM), "needs POSIX shared memory")
+class SharedCatalogTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.writeCatalog({"Hello": "Hallo"})
+        # a scope of its own, so other runs don't share the segments
+        self.scope = f"test-{uuid.uuid4()}"
+        self.before = self.segments()
+        self.debug = []
+
+    def writeCatalog(self, catalog):
+        with open(os.path.join(self.directory, "de.json"), "w", encoding="utf-8") as file:
+            json.dump(catalog, file)
+
+    def options(self):
+        return {
+            "locales": ["de"],
+            "directory": self.directory,
+            "defaultLocale": "de",
+            "sharedCatalog": self.scope,
+            "updateFiles": False,
+            "logDebugFn": lambda message: self.debug.append(message),
+        }
+
+    def segments(self):
+        return {name for name in os.listdir(SHM) if name.startswith("i18n-")}
+
+    def created(self):
+        return self.segments() - self.before
+
+    def lockFiles(self, names):
+        # the lock and users files are named after the control block
+        controls = {name for name in names if name.count("-") == 2}
+        return [
+            name
+            for name in os.listdir(tempfile.gettempdir())
+            if name.rsplit(".", 1)[0] in controls
+        ]
+
+    def logged(self, text):
+        return [line for line in self.debug if text in line]
+
+    def test_generation_handoff(self):
+        first = I18n(self.options())
+        self.assertEqual(getattr(first, "__")("Hello"), "Hallo")
+        self.assertEqual(len(self.logged("shared memory generation 1")), 1)
+        # the control block and the first generation
+        self.assertEqual(len(self.created()), 2)
+        names = self.created()
+
+        # the next reader of a changed file publishes the next generation
+        self.writeCatalog({"Hello": "Guten Tag"})
+        second = I18n(self.options())
+        self.assertEqual(getattr(second, "__")("Hello"), "Guten Tag")
+        self.assertEqual(len(self.logged("shared memory generation 2")), 1)
+        self.assertEqual(len(self.created()), 2)
+        self.assertEqual(len(self.created() & names), 1)
+
+        # the previous generation is unlinked, but still mapped by its user
+        self.assertEqual(getattr(first, "__")("Hello"), "Hallo")
+
+        # which attaches to the current one on its next read
+        first.configure(self.options())
+        self.assertEqual(getattr(first, "__")("Hello"), "Guten Tag")
+        self.assertEqual(len(self.logged("published")), 2)
+        self.assertEqual(self.logged("unlinked"), [])
+
+    def test_last_user_unlinks(self):
+        first = I18n(self.options())
+        second = I18n(self.options())
+        names = self.created()
+        self.assertEqual(len(names), 2)
+        self.assertEqual(len(self.lockFiles(names)), 2)
+
+        del first
+        gc.collect()
+        self.assertEqual(self.created(), names)
+        self.assertEqual(self.logged("unlinked"), [])
+
+        second.releaseSharedCatalogs()
+        self.assertEqual(self.created(), set())
+        self.assertEqual(self.lockFiles(names), [])
+        self.assertEqual(len(self.logged("unlinked")), 1)
+
+        # still translating from its mapping, the next read publishes again
+        self.assertEqual(getattr(second, "__")("Hello"), "Hallo")
+        second.configure(self.options())
+        self.assertEqual(len(self.created()), 2)
+        second.releaseSharedCatalogs()
+        self.assertEqual(self.created(), set())
+
+    def test_unlinked_by_the_last_process_at_exit(self):
+        script = (
+            "import sys\n"
+            "from simple_i18n.I18n import I18n\n"
+            "translate = I18n({'locales': ['de'], 'directory': sys.argv[1],"
+            " 'defaultLocale': 'de', 'sharedCatalog': sys.argv[2],"
+            " 'updateFiles': False}).__\n"
+            "print(translate('Hello'), flush=True)\n"
+            "sys.stdin.readline()\n"
+        )
+        child = subprocess.Popen(
+            [sys.executable, "-W", "ignore", "-c", script, self.directory, self.scope],
+            cwd=ROOT,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            text=True,
+        )
+        self.addCleanup(child.kill)
+        self.assertEqual(child.stdout.readline().strip(), "Hallo")
+        names = self.created()
+        self.assertEqual(len(names), 2)
+
+        # attached to what the other process published, which outlives this user
+        i18n = I18n(self.options())
+        self.assertEqual(getattr(i18n, "__")("Hello"), "Hallo")
+        self.assertEqual(self.logged("published"), [])
+        i18n.releaseSharedCatalogs()
+        self.assertEqual(self.created(), names)
+
+        child.communicate("\n", timeout=60)
+        self.assertEqual(child.returncode, 0)
+        self.assertEqual(self.created(), set())
+        self.assertEqual(self.lockFiles(names), [])
+
+
+if __name__ == "__main__":
+    unittest.main()